@@ -0,0 +1,90 @@
+import argparse
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import simulation as sim
+from clock import run_virtual
+from bot import PlanningBot
+
+
+def play_autoplay_game(seed, seconds=600.0, bot='autoplay'):
+    """Plays one seeded game without a window and returns its result.
+
+    bot is 'autoplay' for the built-in autoplay, or 'planner' for PlanningBot
+    with a fixed rollout budget so results do not depend on machine speed.
+    """
+    state = sim.new_game(verbose=False, seed=seed)
+    planner = PlanningBot(max_rollouts=8, time_budget=None) if bot == 'planner' else None
+    if planner is None:
+        inputs = sim.Inputs()
+        inputs.toggle_autoplay = True
+        sim.step(state, sim.FIXED_DT, inputs)
+    run_virtual(lambda dt: sim.step(state, dt, planner.inputs(state) if planner else None),
+                sim.FIXED_DT, int(round(seconds / sim.FIXED_DT)), done=lambda: state.phase == 'GAME_OVER')
+    return {
+        'bot': bot,
+        'seed': seed,
+        'score': state.score,
+        'tiles': state.tile_count,
+        'boat_segments': state.boat_segments_completed,
+        'cause': state.cause_of_death or 'survived',
+        'time': state.time,
+    }
+
+
+def _play_chunk(seeds, seconds, bot):
+    return [play_autoplay_game(seed, seconds, bot) for seed in seeds]
+
+
+def run_batch(games, seconds=600.0, first_seed=0, workers=None, chunk_size=64, bot='autoplay'):
+    """Plays seeds first_seed .. first_seed + games - 1 across a process pool.
+
+    Seeds are handed out in chunks so each worker imports the game once and
+    sends back one list of results per chunk. Results come back in seed
+    order whatever the worker count, so a batch can be rerun exactly.
+    """
+    seeds = list(range(first_seed, first_seed + games))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    if workers == 1:
+        return [result for chunk in chunks for result in _play_chunk(chunk, seconds, bot)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_play_chunk, chunk, seconds, bot) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+
+def summarize(results):
+    lines = [f"games: {len(results)}"]
+    for key in ('score', 'tiles', 'boat_segments'):
+        values = [result[key] for result in results]
+        lines.append(f"{key}: mean {statistics.fmean(values):.2f}, median {statistics.median(values)}, "
+                     f"min {min(values)}, max {max(values)}")
+    causes = Counter(result['cause'] for result in results)
+    for cause, count in causes.most_common():
+        lines.append(f"  {cause}: {count} ({100.0 * count / len(results):.1f}%)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded autoplay games headless and summarise the results.")
+    parser.add_argument('games', type=int, nargs='?', default=1000)
+    parser.add_argument('--seconds', type=float, default=600.0, help="simulated time limit per game")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--bot', nargs='+', choices=('autoplay', 'planner'), default=['autoplay'],
+                        help="bots to play the same seeds with")
+    args = parser.parse_args()
+
+    for bot in args.bot:
+        start = time.perf_counter()
+        results = run_batch(args.games, args.seconds, args.seed, args.workers, args.chunk_size, bot)
+        elapsed = time.perf_counter() - start
+        print(f"== {bot} ==")
+        for line in summarize(results):
+            print(line)
+        print(f"{args.games} games in {elapsed:.1f}s with {args.workers} workers")
+
+if __name__ == "__main__":
+    main()
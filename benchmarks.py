@@ -0,0 +1,388 @@
+import sys
+import copy
+import math
+import time
+import random
+import tracemalloc
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+from OpenGL.GLU import *
+from tile_renderer import TileRenderer
+from font import FontAtlas
+from culling import Frustum
+from bullets import BulletPool
+from entities import Tile
+from rng import RandomStreams
+from course import CoursePlanner, KINDS
+from env import VectorEnv, DISCRETE_ACTIONS
+import snapshot
+import simulation as sim
+
+TILE_HEIGHT = 10.0
+
+def make_tiles(count, seed=1):
+    rng = random.Random(seed)
+    return [Tile(rng.uniform(-170, 170), 0, -150.0 * i, 60.0, 'safe', (rng.random(), rng.random(), rng.random()))
+            for i in range(count)]
+
+def legacy_draw_tiles(tiles):
+    """The per-tile glutSolidCube + immediate-mode outline path the game used before TileRenderer."""
+    for tile in tiles:
+        glPushMatrix()
+        glTranslatef(tile.x, tile.y, tile.z)
+        glColor3fv(tile.color)
+        glPushMatrix()
+        glScalef(tile.size, TILE_HEIGHT, tile.size)
+        glutSolidCube(1)
+        glPopMatrix()
+        glColor3f(0.0, 0.0, 0.0)
+        s, h = tile.size / 2.0, TILE_HEIGHT / 2.0
+        glBegin(GL_LINES)
+        verts = [(-s,h,-s), (s,h,-s), (s,h,s), (-s,h,s), (-s,-h,-s), (s,-h,-s), (s,-h,s), (-s,-h,s)]
+        edges = [(0,1), (1,2), (2,3), (3,0), (4,5), (5,6), (6,7), (7,4), (0,4), (1,5), (2,6), (3,7)]
+        for edge in edges:
+            for vertex in edge:
+                glVertex3fv(verts[vertex])
+        glEnd()
+        glPopMatrix()
+
+def time_frames(draw, frames):
+    glFinish()
+    start = time.perf_counter()
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        draw()
+        glFinish()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+window_ready = False
+
+def setup_window():
+    global window_ready
+    if window_ready:
+        return
+    window_ready = True
+    glutInit(sys.argv)
+    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
+    glutInitWindowSize(1000, 800)
+    glutCreateWindow(b"Island Jumper - Benchmarks")
+    glEnable(GL_DEPTH_TEST)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(55, (1000/800), 0.1, 100000)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    gluLookAt(0, 400, 300, 0, 0, -600, 0, 1, 0)
+
+def bench_tiles(frames=300):
+    setup_window()
+    for count in (7, 500):
+        tiles = make_tiles(count)
+        renderer = TileRenderer(TILE_HEIGHT)
+        legacy_ms = time_frames(lambda: legacy_draw_tiles(tiles), frames)
+        batched_ms = time_frames(lambda: renderer.draw(tiles, 0.0), frames)
+        print(f"{count:4d} tiles: legacy {legacy_ms:7.3f} ms/frame, batched {batched_ms:7.3f} ms/frame "
+              f"({legacy_ms / batched_ms:5.1f}x)")
+
+class LegacyBullet:
+    """The per-object bullet the game used before BulletPool."""
+    def __init__(self, x, y, z, angle):
+        self.x, self.y, self.z = x, y, z
+        self.angle = angle
+        self.speed = 70.0
+        self.start_x, self.start_y, self.start_z = x, y, z
+
+    def update(self, dt):
+        rad = math.radians(self.angle)
+        self.x += -self.speed * math.sin(rad) * dt
+        self.z += -self.speed * math.cos(rad) * dt
+
+    def has_expired(self):
+        dist = math.sqrt((self.x - self.start_x)**2 + (self.y - self.start_y)**2 + (self.z - self.start_z)**2)
+        return dist > 420
+
+def bench_bullets(minutes=3, dt=1/60.0):
+    """One bullet fired every frame, as when fire is held down in boat mode."""
+    frames = int(minutes * 60 / dt)
+    rng = random.Random(1)
+    angles = [rng.uniform(-30, 30) for _ in range(frames)]
+
+    legacy = []
+    start = time.perf_counter()
+    for frame in range(frames):
+        legacy.append(LegacyBullet(0.0, 35.0, -frame * 5.0, angles[frame]))
+        for bullet in legacy:
+            bullet.update(dt)
+        legacy[:] = [b for b in legacy if not b.has_expired()]
+    legacy_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    pool = BulletPool(70.0, 420)
+    start = time.perf_counter()
+    for frame in range(frames):
+        pool.spawn(0.0, 35.0, -frame * 5.0, angles[frame])
+        pool.update(dt)
+    pool_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    print(f"{minutes} min of continuous fire ({len(pool)} bullets live): "
+          f"objects {legacy_ms:.4f} ms/frame, pool {pool_ms:.4f} ms/frame ({legacy_ms / pool_ms:.1f}x)")
+
+def bench_collisions(bullet_count=500, target_count=300, frames=200):
+    """Bullets spread along the river against floating coconuts, nested loops vs the Z index."""
+    rng = random.Random(2)
+    targets = [(rng.uniform(-180, 180), rng.uniform(40, 60), rng.uniform(-30000, 0))
+               for _ in range(target_count)]
+    # A third of the bullets sit on a target, the rest are misses
+    shots = []
+    for i in range(bullet_count):
+        if i % 3 == 0:
+            x, y, z = rng.choice(targets)
+            shots.append((x + rng.uniform(-3, 3), y, z + rng.uniform(-3, 3), 0.0))
+        else:
+            shots.append((rng.uniform(-200, 200), rng.uniform(40, 60), rng.uniform(-30000, 0), 0.0))
+
+    fired = [LegacyBullet(*shot) for shot in shots]
+    legacy_hits = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        bullets = list(fired)
+        for x, y, z in targets:
+            for bullet in bullets[:]:
+                dist = math.sqrt((bullet.x - x)**2 + (bullet.y - y)**2 + (bullet.z - z)**2)
+                if dist < 6.0:
+                    bullets.remove(bullet)
+                    legacy_hits += 1
+                    break
+    legacy_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    pool = BulletPool(70.0, 420)
+    for shot in shots:
+        pool.spawn(*shot)
+    indexed_hits = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        pool.alive[:pool.count] = True
+        for x, y, z in targets:
+            hit = pool.first_in_sphere(x, y, z, 5.0)
+            if hit != -1:
+                pool.kill(hit)
+                indexed_hits += 1
+    indexed_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    print(f"{bullet_count} bullets x {target_count} targets: nested loops {legacy_ms:.3f} ms/frame, "
+          f"Z index {indexed_ms:.3f} ms/frame ({legacy_ms / indexed_ms:.1f}x, "
+          f"hits {legacy_hits // frames} vs {indexed_hits // frames} per frame)")
+
+def bench_entities(count=20000, passes=50):
+    """Memory per tile and hot-loop attribute access, dict tiles vs slotted Tile records."""
+    def make_dicts():
+        return [{'pos': [float(i), 0, -150.0 * i], 'size': 60.0, 'type': 'safe',
+                 'color': [0.5, 0.5, 0.5], 'origin_x': float(i), 'player_on_tile': False,
+                 'move_dir': 1, 'move_range': 50.0, 'move_speed': 10.0} for i in range(count)]
+
+    def make_records():
+        tiles = [Tile(float(i), 0, -150.0 * i, 60.0, 'safe', (0.5, 0.5, 0.5)) for i in range(count)]
+        for tile in tiles:
+            tile.move_dir, tile.move_range, tile.move_speed = 1, 50.0, 10.0
+        return tiles
+
+    def measure(factory):
+        tracemalloc.start()
+        items = factory()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return items, size / count
+
+    dicts, dict_bytes = measure(make_dicts)
+    records, record_bytes = measure(make_records)
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        for tile in dicts:
+            tile['pos'][0] += tile['move_speed'] * tile['move_dir'] * (1/60.0)
+            if tile.get('is_active') or tile['type'] == 'moving':
+                pass
+    dict_ms = (time.perf_counter() - start) * 1000.0 / passes
+
+    start = time.perf_counter()
+    for _ in range(passes):
+        for tile in records:
+            tile.x += tile.move_speed * tile.move_dir * (1/60.0)
+            if tile.is_active or tile.type == 'moving':
+                pass
+    record_ms = (time.perf_counter() - start) * 1000.0 / passes
+
+    print(f"memory per tile: dict {dict_bytes:.0f} B, slotted {record_bytes:.0f} B")
+    print(f"moving-tile update over {count} tiles: dict {dict_ms:.2f} ms, slotted {record_ms:.2f} ms "
+          f"({dict_ms / record_ms:.2f}x)")
+
+def bench_rng(draws=1000000):
+    """Cost per draw: stdlib random, scalar NumPy Generator calls and a block-filled RandomStream."""
+    stream = RandomStreams(seed=1).course
+    generator = np.random.default_rng(1)
+    rng = random.Random(1)
+    for label, draw in (('random.Random.random', rng.random),
+                        ('Generator.random() per call', generator.random),
+                        ('RandomStream.random', stream.random)):
+        count = draws if label != 'Generator.random() per call' else draws // 10
+        start = time.perf_counter()
+        for _ in range(count):
+            draw()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed * 1e9 / count:.0f} ns per draw")
+
+def bench_course(tiles=1000000, chunk_size=65536):
+    """Planning a long course for analysis, and the per-chunk cost the game pays while prefetching."""
+    planner = CoursePlanner(RandomStreams(seed=1), sim.COURSE_TABLE, sim.TILE_SIZE, sim.JUMP_DISTANCE, sim.RIVER_WIDTH)
+    counts = np.zeros(len(KINDS), dtype=np.int64)
+    start = time.perf_counter()
+    planned = 0
+    for chunk in planner.chunks(chunk_size):
+        counts += np.bincount(chunk.kind, minlength=len(KINDS))
+        planned += len(chunk)
+        if planned >= tiles:
+            break
+    elapsed = time.perf_counter() - start
+    print(f"{planned} tiles planned in {elapsed:.3f}s")
+    print(", ".join(f"{kind} {100.0 * count / planned:.1f}%" for kind, count in zip(KINDS, counts)))
+
+    start = time.perf_counter()
+    for _ in range(100):
+        planner.next_chunk(1024)
+    print(f"1024-tile prefetch chunk: {(time.perf_counter() - start) * 10:.2f} ms")
+
+def bench_kinematics(seconds=120.0, dt=1/60.0):
+    """Stepping a moving tile frame by frame against reading its closed-form position."""
+    tile = Tile(0.0, 0, 0.0, sim.TILE_SIZE, 'moving', sim.MOVING_COLOR)
+    tile.move_dir, tile.move_speed = 1, 40.0
+    tile.move_low, tile.move_high = -sim.RIVER_WIDTH + tile.size/2, sim.RIVER_WIDTH - tile.size/2
+    frames = int(round(seconds / dt))
+
+    # The old per-frame bounce, which overshoots a wall by up to a frame's travel before turning
+    stepped_x, move_dir = tile.x, tile.move_dir
+    start = time.perf_counter()
+    for _ in range(frames):
+        stepped_x += tile.move_speed * move_dir * dt
+        if not (tile.move_low < stepped_x < tile.move_high):
+            move_dir *= -1
+    stepped_ms = (time.perf_counter() - start) * 1000.0
+
+    start = time.perf_counter()
+    exact_x = tile.x_at(frames * dt)
+    exact_ms = (time.perf_counter() - start) * 1000.0
+
+    print(f"{seconds:.0f}s of motion: stepped {stepped_ms:.3f} ms, closed form {exact_ms:.4f} ms")
+    print(f"final x: stepped {stepped_x:.2f}, closed form {exact_x:.2f} (drift {abs(stepped_x - exact_x):.2f})")
+
+def bench_env(num_envs=64, steps=300):
+    """Vectorised environment throughput with random discrete actions."""
+    envs = VectorEnv(num_envs, seed=0)
+    envs.reset()
+    actions = np.random.default_rng(0).integers(0, len(DISCRETE_ACTIONS), size=(steps, num_envs))
+    start = time.perf_counter()
+    finished = 0
+    for row in actions:
+        _, _, terminated, truncated, _ = envs.step(row)
+        finished += int(terminated.sum() + truncated.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{num_envs} envs x {steps} steps: {num_envs * steps / elapsed:.0f} env steps/s, {finished} episodes finished")
+
+def bench_snapshot(steps=3000, repeats=2000):
+    """Saving and restoring a mid-game state, against copy.deepcopy."""
+    state = sim.new_game(verbose=False, seed=3)
+    inputs = sim.Inputs()
+    inputs.toggle_autoplay = True
+    sim.step(state, sim.FIXED_DT, inputs)
+    sim.run_for(state, steps * sim.FIXED_DT)
+    data = snapshot.save(state)
+    scratch = snapshot.restore(data)
+
+    def per_call(fn, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        return (time.perf_counter() - start) * 1e6 / count
+
+    print(f"snapshot: {len(data)} bytes")
+    print(f"save {per_call(lambda: snapshot.save(state), repeats):.1f} us, "
+          f"restore {per_call(lambda: snapshot.restore(data), repeats // 10):.1f} us, "
+          f"restore into scratch {per_call(lambda: snapshot.restore(data, into=scratch), repeats):.1f} us, "
+          f"deepcopy {per_call(lambda: copy.deepcopy(state), repeats // 10):.1f} us")
+
+def legacy_draw_lines(lines, font=GLUT_BITMAP_HELVETICA_18):
+    """Per-character glutBitmapCharacter text, as the HUD drew it before FontAtlas."""
+    glColor3f(1.0, 1.0, 1.0)
+    for x, y, string in lines:
+        glRasterPos2f(x, y)
+        for ch in string:
+            glutBitmapCharacter(font, ord(ch))
+
+def bench_font(frames=300):
+    """Glyphs per millisecond for HUD-sized text, GLUT bitmaps against the texture atlas."""
+    setup_window()
+    atlas = FontAtlas()
+    atlas.build()
+    glDisable(GL_DEPTH_TEST)
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    gluOrtho2D(0, 1000, 0, 800)
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    sample = "Coconuts Collected: 12/40 (Max: 40) Score: 1234"
+    for count in (10, 60):
+        lines = [(10 + 40 * (i % 4), 780 - 13 * i, sample) for i in range(count)]
+        glyphs = count * len(sample)
+        legacy_ms = time_frames(lambda: legacy_draw_lines(lines), frames)
+        atlas_ms = time_frames(lambda: atlas.draw_lines(lines), frames)
+        print(f"{glyphs:5d} glyphs: glutBitmapCharacter {glyphs / legacy_ms:8.0f} glyphs/ms, "
+              f"atlas {glyphs / atlas_ms:8.0f} glyphs/ms ({legacy_ms / atlas_ms:5.1f}x)")
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glEnable(GL_DEPTH_TEST)
+    atlas.release()
+
+def bench_culling(count=2000, repeats=500):
+    """Frustum culling a long river of obstacles from the game camera."""
+    rng = np.random.default_rng(1)
+    centers = np.column_stack([rng.uniform(-190, 190, count), np.full(count, 10.0), -np.arange(count) * 60.0])
+    radii = rng.uniform(15, 35, count) * 0.87
+    for max_distance in (None, 800.0):
+        frustum = Frustum(max_distance)
+        player_z = -count * 30.0
+        frustum.set_camera(55, 1000/800, 0.1, 5000, (0, 150, player_z + 220), (0, 0, player_z))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            mask = frustum.cull('obstacles', centers, radii)
+        elapsed_us = (time.perf_counter() - start) * 1e6 / repeats
+        print(f"draw distance {max_distance or 'far plane'}: {int(mask.sum())} of {count} drawn, "
+              f"{elapsed_us:.1f} us per cull")
+
+BENCHMARKS = {
+    'tiles': bench_tiles,
+    'bullets': bench_bullets,
+    'collisions': bench_collisions,
+    'entities': bench_entities,
+    'rng': bench_rng,
+    'course': bench_course,
+    'kinematics': bench_kinematics,
+    'env': bench_env,
+    'snapshot': bench_snapshot,
+    'font': bench_font,
+    'culling': bench_culling,
+}
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import math
+import time
+from collections import deque
+import simulation as sim
+import snapshot
+
+
+def jump_duration(state):
+    return sim.POWER_UP_JUMP_DURATION if state.picked_power_up else sim.PLAYER_JUMP_DURATION
+
+
+def heading_to(from_x, from_z, to_x, to_z):
+    """Arrow angle in degrees that points from one spot to another (0 = -Z)."""
+    return math.degrees(math.atan2(-(to_x - from_x), -(to_z - from_z)))
+
+
+def predicted_x(state, tile, seconds):
+    """Where a tile's centre will be `seconds` from now, bounces off the banks included."""
+    return tile.x_at(state.time + seconds)
+
+
+def aim(state, angle, **fields):
+    """Inputs that turn the arrow to `angle` this step, plus any extra input fields."""
+    inputs = sim.Inputs()
+    inputs.aim = angle - state.arrow_angle
+    for name, value in fields.items():
+        setattr(inputs, name, value)
+    return inputs
+
+
+def dodge(state):
+    """Strafe direction away from the closest rock ahead, as the built-in autoplay steers."""
+    player_x, player_z = state.player_pos[0], state.player_pos[2]
+    ahead = [obs for obs in state.obstacles if player_z - 200 < obs.z < player_z]
+    if not ahead:
+        return 0.0
+    closest = max(ahead, key=lambda obs: obs.z)
+    if abs(player_x - closest.x) >= closest.size / 2 + 40:
+        return 0.0
+    return -1.0 if player_x < closest.x else 1.0
+
+
+def greedy_inputs(state):
+    """The default policy: jump straight at where the next tile will be on landing."""
+    inputs = sim.Inputs()
+    if state.phase == 'BOAT_MODE':
+        inputs.strafe = dodge(state)
+    elif state.phase == 'AIMING' and not state.autoplay_active:
+        target = state.tiles.next_target
+        if target is not None:
+            if state.shooting_mode:
+                inputs.toggle_shooting = True
+                return inputs
+            x, z = state.player_pos[0], state.player_pos[2]
+            inputs = aim(state, heading_to(x, z, predicted_x(state, target, jump_duration(state)), target.z), click=True)
+    return inputs
+
+
+def shot_angle(state, trunk_x, trunk_z):
+    """Player angle that sends a bullet from the gun hand through a tree trunk."""
+    angle = heading_to(state.player_pos[0], state.player_pos[2], trunk_x, trunk_z) + 90
+    # The hand sits beside the body, so refine the angle from the hand a couple of times
+    for _ in range(3):
+        rad = math.radians(angle)
+        hand_x = state.player_pos[0] + sim.BULLET_HAND_X * math.cos(rad)
+        hand_z = state.player_pos[2] + sim.BULLET_HAND_X * math.sin(rad)
+        angle = heading_to(hand_x, hand_z, trunk_x, trunk_z) + 90
+    return angle
+
+
+class PlanningBot:
+    """Autoplay that tries candidate moves on copies of the game and keeps the best.
+
+    At each decision (standing on a tile, aiming) the bot lists candidate
+    action sequences: jump now aiming at where the next tile will be, jump
+    slightly off that point, wait a little first, or shoot an unshot
+    coconut tree within reach. Each candidate is played on a copy of the
+    state, restored from one snapshot into a reused scratch game, and the
+    greedy policy carries on for `horizon` steps in total, a few tiles
+    further, so traps, moving tiles and slow bullets have time to pay off.
+    The candidate with the highest score at the end wins; ties go to the
+    earlier, simpler candidate.
+
+    Candidates are tried in that order until `max_rollouts` or
+    `time_budget` seconds run out, so a decision can be held to a frame.
+    Set time_budget=None for runs that must be reproducible.
+    """
+
+    def __init__(self, horizon=240, waits=(6, 15, 30), offsets=(-8.0, 8.0, -16.0, 16.0),
+                 max_rollouts=None, time_budget=0.010):
+        self.horizon = horizon
+        self.waits = waits
+        self.offsets = offsets
+        self.max_rollouts = max_rollouts
+        self.time_budget = time_budget
+        self.plan = deque()
+        self.scratch = None
+        self.decisions = 0
+        self.rollouts = 0
+
+    def reset(self):
+        self.plan.clear()
+
+    def inputs(self, state):
+        """Inputs for the next simulation step."""
+        if state.phase != 'AIMING' or state.autoplay_active:
+            self.plan.clear()
+            return greedy_inputs(state)
+        if not self.plan:
+            self.plan.extend(self.decide(state))
+        return self.plan.popleft() if self.plan else sim.Inputs()
+
+    def candidates(self, state):
+        """Action sequences to try, most promising first, as functions of the copied state."""
+        target = state.tiles.next_target
+        if target is None:
+            return []
+        seconds = jump_duration(state)
+        x, z = state.player_pos[0], state.player_pos[2]
+
+        def jump_at(offset, wait=0):
+            def actions(copy_state):
+                land_x = predicted_x(copy_state, target, wait * sim.FIXED_DT + seconds) + offset
+                return [sim.Inputs() for _ in range(wait)] + [
+                    aim(copy_state, heading_to(x, z, land_x, target.z), click=True)]
+            return actions
+
+        def shoot(tile):
+            def actions(copy_state):
+                trunk_x = tile.x + tile.size * 0.35
+                shot = aim(copy_state, shot_angle(copy_state, trunk_x, tile.z), toggle_shooting=True, click=True)
+                holster = sim.Inputs()
+                holster.toggle_shooting = True
+                return [shot, holster]
+            return actions
+
+        found = [jump_at(0.0)]
+        for seq in range(state.tiles.current_seq, state.tiles.current_seq + 3):
+            tile = state.tiles.by_seq(seq)
+            if tile is not None and tile.type == 'coconut' and not tile.tree_shot:
+                found.append(shoot(tile))
+        found.extend(jump_at(offset) for offset in self.offsets)
+        found.extend(jump_at(0.0, wait) for wait in self.waits)
+        return found
+
+    def rollout(self, saved, actions):
+        """Score after playing `actions` on a copy of the saved state, then the greedy policy."""
+        trial = self.scratch = snapshot.restore(saved, into=self.scratch)
+        trial.verbose = False
+        planned = actions(trial)
+        self.rollouts += 1
+        for step in range(self.horizon):
+            if trial.phase == 'GAME_OVER':
+                return trial.score - 1000, planned
+            sim.step(trial, sim.FIXED_DT, planned[step] if step < len(planned) else greedy_inputs(trial))
+        return trial.score, planned
+
+    def decide(self, state):
+        self.decisions += 1
+        start = time.perf_counter()
+        best_value, best_plan = None, []
+        saved = snapshot.save(state)
+        for tried, actions in enumerate(self.candidates(state)):
+            if tried and self.max_rollouts is not None and tried >= self.max_rollouts:
+                break
+            if tried and self.time_budget is not None and time.perf_counter() - start > self.time_budget:
+                break
+            value, planned = self.rollout(saved, actions)
+            if best_value is None or value > best_value:
+                best_value, best_plan = value, planned
+        return best_plan
@@ -0,0 +1,135 @@
+import math
+import numpy as np
+from spatial import ZBuckets
+
+
+class BulletPool:
+    """All live bullets stored as parallel NumPy arrays.
+
+    Live bullets occupy the first `count` rows in the order they were fired.
+    update() moves every bullet with one vectorised add and drops expired
+    or hit bullets with one mask compaction, so per-frame cost does not
+    grow with Python object churn. Hits are recorded with kill() and take
+    effect immediately for later queries in the same frame.
+
+    Hit queries go through a ZBuckets index over the bullets' Z positions,
+    rebuilt lazily after bullets move, so each target only tests nearby
+    bullets.
+    """
+
+    def __init__(self, speed, max_distance, radius=1.0, capacity=64, cell_size=50.0):
+        self.speed = speed
+        self.max_distance_sq = max_distance * max_distance
+        self.radius = radius
+        self.count = 0
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.origin = np.zeros((capacity, 3))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.index = ZBuckets(cell_size)
+        self._index_stale = True
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def _grow(self):
+        capacity = len(self.alive) * 2
+        for name in ('position', 'velocity', 'origin'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, 3))
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.count] = self.alive[:self.count]
+        self.alive = alive
+
+    def spawn(self, x, y, z, angle):
+        """Fires a bullet heading `angle` degrees around the Y axis (0 = -Z)."""
+        if self.count == len(self.alive):
+            self._grow()
+        i = self.count
+        rad = math.radians(angle)
+        self.position[i] = (x, y, z)
+        self.origin[i] = (x, y, z)
+        self.velocity[i] = (-self.speed * math.sin(rad), 0.0, -self.speed * math.cos(rad))
+        self.alive[i] = True
+        self.count += 1
+        self._index_stale = True
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+        self._index_stale = True
+
+    def load(self, position, velocity, origin, alive):
+        """Replaces every bullet with the given rows, as saved from the first `count` rows."""
+        self.clear()
+        count = len(alive)
+        while len(self.alive) < count:
+            self._grow()
+        self.position[:count] = position
+        self.velocity[:count] = velocity
+        self.origin[:count] = origin
+        self.alive[:count] = alive
+        self.count = count
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.position[:n] += self.velocity[:n] * dt
+        self._index_stale = True
+        offset = self.position[:n] - self.origin[:n]
+        in_range = np.einsum('ij,ij->i', offset, offset) <= self.max_distance_sq
+        self._compact(self.alive[:n] & in_range)
+
+    def _compact(self, keep):
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        self.position[:kept] = self.position[:n][keep]
+        self.velocity[:kept] = self.velocity[:n][keep]
+        self.origin[:kept] = self.origin[:n][keep]
+        self.alive[:kept] = True
+        self.alive[kept:n] = False
+        self.count = kept
+
+    def positions(self):
+        """(n, 3) array of live bullet positions, for drawing."""
+        return self.position[:self.count][self.alive[:self.count]]
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def near(self, z_min, z_max):
+        """Indices of bullets in the index cells overlapping [z_min, z_max]."""
+        if self._index_stale:
+            self.index.build(self.position[:self.count, 2])
+            self._index_stale = False
+        return self.index.candidates(z_min, z_max)
+
+    def first_in_sphere(self, x, y, z, radius):
+        """Index of the oldest live bullet overlapping the sphere, or -1."""
+        if not self.count:
+            return -1
+        reach = radius + self.radius
+        near = self.near(z - reach, z + reach)
+        if not len(near):
+            return -1
+        offset = self.position[near] - (x, y, z)
+        hit = self.alive[near] & (np.einsum('ij,ij->i', offset, offset) < reach * reach)
+        return int(near[hit].min()) if hit.any() else -1
+
+    def first_in_column(self, x, z, radius, y_min, y_max):
+        """Index of the oldest live bullet inside the vertical cylinder, or -1."""
+        if not self.count:
+            return -1
+        near = self.near(z - radius, z + radius)
+        if not len(near):
+            return -1
+        pos = self.position[near]
+        dx, dz = pos[:, 0] - x, pos[:, 2] - z
+        hit = (self.alive[near] & (dx * dx + dz * dz < radius * radius) &
+               (pos[:, 1] >= y_min) & (pos[:, 1] <= y_max))
+        return int(near[hit].min()) if hit.any() else -1
@@ -0,0 +1,105 @@
+import time
+
+# Seconds of accumulated rounding error forgiven when deciding whether a step is due
+STEP_TOLERANCE = 1e-9
+
+
+class RealClock:
+    """Monotonic wall-clock time in seconds."""
+
+    def now(self):
+        return time.perf_counter()
+
+
+class VirtualClock:
+    """Time that only moves when advance() is called.
+
+    Lets the fixed-step loop run the simulation faster than real time while
+    producing exactly the same sequence of steps as a real-time session.
+    """
+
+    def __init__(self, start=0.0):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += seconds
+
+
+class ScaledClock:
+    """Another clock run `speed` times faster, for watching replays fast-forwarded."""
+
+    def __init__(self, clock, speed=1.0):
+        self.clock = clock
+        self.speed = speed
+        self._base = clock.now()
+        self._scaled_base = self._base
+
+    def now(self):
+        return self._scaled_base + (self.clock.now() - self._base) * self.speed
+
+    def set_speed(self, speed):
+        # Rebase so time carries on from where it is instead of jumping
+        self._scaled_base = self.now()
+        self._base = self.clock.now()
+        self.speed = speed
+
+
+class FixedStepLoop:
+    """Feeds elapsed clock time into fixed-size simulation steps.
+
+    tick() samples the clock once, adds the elapsed time to an accumulator
+    and calls step_fn(dt) once for every whole dt it holds. The simulation
+    therefore always sees the same dt however fast frames are drawn. After
+    a long stall the backlog is capped at max_steps so the game does not
+    freeze trying to catch up.
+    """
+
+    def __init__(self, clock, step_fn, dt, max_steps=8):
+        self.clock = clock
+        self.step_fn = step_fn
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last_time = None
+        self.steps = 0
+
+    def tick(self):
+        now = self.clock.now()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = 0
+        # The tolerance keeps rounding in the summed frame times from losing a step
+        while self.accumulator >= self.dt - STEP_TOLERANCE and steps < self.max_steps:
+            self.step_fn(self.dt)
+            self.accumulator -= self.dt
+            steps += 1
+        if steps == self.max_steps:
+            self.accumulator = min(self.accumulator, self.dt)
+        self.steps += steps
+        return steps
+
+
+def run_virtual(step_fn, dt, steps, frame=None, done=None):
+    """Runs `steps` fixed steps of step_fn as fast as the CPU allows.
+
+    A FixedStepLoop ticks on a VirtualClock that moves `frame` seconds per
+    tick (one step's worth by default), so headless runs go through the
+    same loop as the windowed game. done(), if given, is checked between
+    ticks and ends the run early. Returns how many steps ran.
+    """
+    clock = VirtualClock()
+    loop = FixedStepLoop(clock, step_fn, dt, max_steps=steps)
+    loop.tick()
+    while loop.steps < steps and not (done is not None and done()):
+        clock.advance(dt if frame is None else frame)
+        # Never run past the requested step count
+        loop.max_steps = steps - loop.steps
+        loop.tick()
+    return loop.steps
@@ -0,0 +1,303 @@
+import numpy as np
+
+# Tile kinds in a planned course. 'frenzy' is a safe tile in frenzy colours.
+KINDS = ('safe', 'moving', 'trap', 'coconut', 'frenzy', 'power_up', 'boat_dock')
+SAFE, MOVING, TRAP, COCONUT, FRENZY, POWER_UP, BOAT_DOCK = range(len(KINDS))
+
+# Uniform draws each slot takes from the course stream, by column
+DOCK_ROLL, ANGLE_ROLL, WILD_ROLL, KIND_ROLL, DIR_ROLL, RANGE_ROLL = range(6)
+
+# One planned slot as CourseBuffer stores it, in take() order
+ROW_DTYPE = np.dtype([('kind', np.int8), ('mode', np.int8), ('mode_left', np.int32), ('dx', np.float64),
+                      ('absolute_x', np.bool_), ('move_dir', np.int8), ('move_range', np.float64)])
+
+BOAT_DOCK_CHANCE = 0.08
+DOCK_FREE_TILES = 11
+
+
+def alias_table(weights):
+    """Vose's alias method: returns (prob, alias) for O(1) sampling of weights.
+
+    To sample, scale one uniform u by n: column i = int(u * n) keeps i if
+    the fractional part is below prob[i] and takes alias[i] otherwise.
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    if n == 0 or weights.min() < 0 or weights.sum() <= 0:
+        raise ValueError("alias table needs non-negative weights with a positive total")
+    scaled = weights * n / weights.sum()
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        prob[low] = scaled[low]
+        alias[low] = high
+        scaled[high] -= 1.0 - scaled[low]
+        (small if scaled[high] < 1.0 else large).append(high)
+    return prob, alias
+
+
+def sample_alias(prob, alias, rolls, rows=None):
+    """Samples an alias table once per roll.
+
+    prob and alias are either one table, or a stack of tables with `rows`
+    choosing the table for each roll.
+    """
+    width = prob.shape[-1]
+    scaled = rolls * width
+    column = scaled.astype(np.intp)
+    cell = column if rows is None else rows * width + column
+    keep = scaled - column < prob.ravel()[cell]
+    return np.where(keep, column, alias.ravel()[cell])
+
+
+class CourseTable:
+    """The game mode table compiled into alias samplers.
+
+    Each mode in `game_modes` names a duration, a "tiles" dict of tile-kind
+    weights and, optionally, a "weight" for how often it is picked and
+    "centered" to line its tiles up in the middle of the river.
+    `tile_rules` maps a kind to the kinds it may not follow and the kind
+    used instead; `wild_tile` is a kind rolled in every mode with its own
+    chance, also with kinds it may not follow.
+    """
+
+    def __init__(self, game_modes, tile_rules, wild_tile):
+        def kind_index(name):
+            if name not in KINDS:
+                raise ValueError(f"unknown tile kind '{name}'")
+            return KINDS.index(name)
+
+        self.mode_names = [mode['name'] for mode in game_modes]
+        self.first_duration = game_modes[0]['duration']
+        base = np.array([mode['duration'] for mode in game_modes])
+        self.duration_low = np.maximum(3, base - 3)
+        self.duration_span = base + 5 - self.duration_low + 1
+        self.centered = np.array([mode.get('centered', False) for mode in game_modes])
+        self.mode_prob, self.mode_alias = alias_table([mode.get('weight', 1.0) for mode in game_modes])
+
+        self.tile_prob = np.empty((len(game_modes), len(KINDS)))
+        self.tile_alias = np.empty((len(game_modes), len(KINDS)), dtype=np.intp)
+        for row, mode in enumerate(game_modes):
+            weights = np.zeros(len(KINDS))
+            for name, weight in mode['tiles'].items():
+                weights[kind_index(name)] = weight
+            self.tile_prob[row], self.tile_alias[row] = alias_table(weights)
+
+        # replace[prev, kind]: what a sampled kind turns into right after prev
+        self.replace = np.tile(np.arange(len(KINDS), dtype=np.int8), (len(KINDS), 1))
+        for name, rule in tile_rules.items():
+            for prev in rule['not_after']:
+                self.replace[kind_index(prev), kind_index(name)] = kind_index(rule['instead'])
+        self.wild_kind = kind_index(wild_tile['kind'])
+        self.wild_chance = wild_tile['chance']
+        self.wild_allowed = np.ones(len(KINDS), dtype=bool)
+        for prev in wild_tile['not_after']:
+            self.wild_allowed[kind_index(prev)] = False
+
+    def pick_modes(self, rolls):
+        return sample_alias(self.mode_prob, self.mode_alias, rolls)
+
+    def outcomes(self, modes, wild_roll, kind_roll):
+        """(len(KINDS), n) array: the kind of each tile for every possible previous kind."""
+        base = sample_alias(self.tile_prob, self.tile_alias, kind_roll, modes)
+        wild = wild_roll < self.wild_chance
+        return np.where(wild[None, :] & self.wild_allowed[:, None], self.wild_kind, self.replace[:, base])
+
+
+class CourseChunk:
+    """A run of planned tiles, one row per slot in every array.
+
+    x and z are nominal positions for a course walked without power-ups;
+    the game itself places each tile relative to the tile before it using
+    dx, or at x = dx when absolute_x is set.
+    """
+    __slots__ = ('start', 'kind', 'mode', 'mode_left', 'dx', 'absolute_x', 'move_dir', 'move_range', 'x', 'z')
+
+    def __len__(self):
+        return len(self.kind)
+
+
+class CoursePlanner:
+    """Plans the endless course ahead of the player in vectorised chunks.
+
+    Every slot takes a fixed six values from the course stream and every
+    game mode two from the modes stream, so a chunk is drawn with one NumPy
+    call per stream, and tile kinds come from the CourseTable's alias
+    samplers. The rules that look at the previous tile (no boat dock
+    straight after another, the table's tile rules) are solved with array
+    operations rather than a loop over slots; only the clamped X walk is
+    carried slot by slot, to keep it exact.
+    """
+
+    def __init__(self, streams, table, tile_size, jump_distance, river_width):
+        self.course_rng = streams.course.generator
+        self.modes_rng = streams.modes.generator
+        self.table = table
+        self.jump_distance = jump_distance
+        self.x_limit = river_width - tile_size / 2
+        # Where the previous chunk left off
+        self.slots = 0
+        self.tile_count = 0
+        self.spawn_count = 0
+        self.prev_kind = SAFE
+        self.last_x = 0.0
+        self.run_modes = [0]
+        self.run_lengths = [table.first_duration]
+
+    def _mode_runs(self, tiles_needed):
+        """Draws new game modes until the pending runs cover tiles_needed tiles."""
+        while sum(self.run_lengths) < tiles_needed:
+            count = (tiles_needed - sum(self.run_lengths)) // 3 + 1
+            draws = self.modes_rng.random((count, 2))
+            modes = self.table.pick_modes(draws[:, 0])
+            lengths = self.table.duration_low[modes] + (draws[:, 1] * self.table.duration_span[modes]).astype(np.intp)
+            self.run_modes.extend(modes.tolist())
+            self.run_lengths.extend(lengths.tolist())
+
+    def _plan_docks(self, rolls):
+        # Slot 0 stands for the last tile of the previous chunk. Within a run
+        # of candidate slots every other one becomes a dock, starting with
+        # the first, so two docks never follow each other.
+        candidate = np.concatenate(([self.prev_kind == BOAT_DOCK], rolls < BOAT_DOCK_CHANCE))
+        candidate[1:1 + max(0, DOCK_FREE_TILES - self.tile_count)] = False
+        index = np.arange(len(candidate))
+        run_start = candidate.copy()
+        run_start[1:] &= ~candidate[:-1]
+        start = np.maximum.accumulate(np.where(run_start, index, 0))
+        return (candidate & ((index - start) % 2 == 0))[1:]
+
+    def _plan_modes(self, count):
+        """Game mode of the next `count` regular tiles and how many tiles each mode has left after them."""
+        self._mode_runs(count)
+        lengths = np.array(self.run_lengths)
+        ends = np.cumsum(lengths)
+        modes = np.repeat(np.array(self.run_modes), lengths)[:count]
+        mode_left = np.repeat(ends, lengths)[:count] - 1 - np.arange(count)
+        cut = int(np.searchsorted(ends, count, 'left'))
+        self.run_modes = self.run_modes[cut:]
+        self.run_lengths = [int(ends[cut]) - count] + self.run_lengths[cut + 1:]
+        return modes, mode_left
+
+    def next_chunk(self, size):
+        draws = self.course_rng.random((size, 6))
+        dock = self._plan_docks(draws[:, DOCK_ROLL])
+        regular = ~dock
+        count = int(np.count_nonzero(regular))
+        modes, mode_left = self._plan_modes(count)
+
+        # Kind of each slot after every possible previous kind; docks never depend on it
+        outcomes = np.full((len(KINDS), size), BOAT_DOCK, dtype=np.int8)
+        outcomes[:, regular] = self.table.outcomes(modes, draws[regular, WILD_ROLL], draws[regular, KIND_ROLL])
+        kind = outcomes[SAFE].copy()
+        pending = (outcomes != outcomes[0]).any(axis=0)
+        # Settle dependent tiles in waves: each wave fixes every pending tile whose predecessor is settled
+        settled = ~pending
+        waiting = np.flatnonzero(pending)
+        while len(waiting):
+            ready = (waiting == 0) | settled[waiting - 1]
+            index = waiting[ready]
+            before = np.where(index == 0, self.prev_kind, kind[index - 1])
+            kind[index] = outcomes[before, index]
+            settled[index] = True
+            waiting = waiting[~ready]
+
+        chunk = CourseChunk()
+        chunk.start = self.slots
+        chunk.kind = kind
+        chunk.mode = np.full(size, -1, dtype=np.int8)
+        chunk.mode[regular] = modes
+        chunk.mode_left = np.zeros(size, dtype=np.int32)
+        chunk.mode_left[regular] = mode_left
+
+        # Zig-zag: every other regular tile swings up to 40 degrees off the last one
+        spawn = self.spawn_count + np.cumsum(regular)
+        angle = np.radians(-40 + 80 * draws[:, ANGLE_ROLL])
+        chunk.dx = np.where(regular & (spawn % 2 == 1), -self.jump_distance * np.sin(angle), 0.0)
+        # Centered modes go straight up the middle of the river, as do boat docks
+        chunk.absolute_x = dock | (regular & self.table.centered[chunk.mode])
+        chunk.dx[chunk.absolute_x] = 0.0
+        chunk.move_dir = np.where(draws[:, DIR_ROLL] < 0.5, -1, 1).astype(np.int8)
+        chunk.move_range = 40 + 40 * draws[:, RANGE_ROLL]
+        chunk.x = self._walk_x(chunk.dx, chunk.absolute_x)
+        chunk.z = -self.jump_distance * np.arange(self.slots + 1, self.slots + size + 1)
+
+        self.slots += size
+        self.tile_count += count
+        self.spawn_count += count
+        self.prev_kind = int(kind[-1])
+        return chunk
+
+    def _walk_x(self, dx, absolute_x):
+        """Nominal X of every slot: each step adds dx (or jumps to it) and clamps to the river.
+
+        The walk is carried slot by slot, in the same order of float
+        operations as placing the tiles one at a time, so X does not depend
+        on where the chunks are cut.
+        """
+        limit = self.x_limit
+        shift = np.where(absolute_x, 0.0, dx).tolist()
+        low = np.where(absolute_x, dx, -limit).tolist()
+        high = np.where(absolute_x, dx, limit).tolist()
+        xs = []
+        x = self.last_x
+        for step, step_low, step_high in zip(shift, low, high):
+            x = min(max(x + step, step_low), step_high)
+            xs.append(x)
+        if xs:
+            self.last_x = x
+        return np.array(xs)
+
+    def chunks(self, size):
+        while True:
+            yield self.next_chunk(size)
+
+
+class CourseBuffer:
+    """Planned tiles waiting to be placed, refilled a chunk at a time.
+
+    take() hands out the next planned slot as a tuple. prefetch() plans the
+    next chunk once fewer than `low_water` slots are left, so the game can
+    call it on frames where the player is not landing; take() only plans
+    on the spot if the buffer ran dry. Waiting slots are kept in one
+    ROW_DTYPE array, which copies and snapshots as a single block.
+    """
+
+    def __init__(self, planner, chunk_size=1024, low_water=256):
+        self.planner = planner
+        self.chunk_size = chunk_size
+        self.low_water = low_water
+        self._rows = np.zeros(0, dtype=ROW_DTYPE)
+        self._next = 0
+
+    def __len__(self):
+        return len(self._rows) - self._next
+
+    def waiting(self):
+        """The planned slots not taken yet, as ROW_DTYPE rows."""
+        return self._rows[self._next:]
+
+    def set_waiting(self, rows):
+        self._rows = rows
+        self._next = 0
+
+    def prefetch(self):
+        if len(self) >= self.low_water:
+            return False
+        chunk = self.planner.next_chunk(self.chunk_size)
+        rows = np.empty(len(chunk), dtype=ROW_DTYPE)
+        for name in ROW_DTYPE.names:
+            rows[name] = getattr(chunk, name)
+        self._rows = np.concatenate((self._rows[self._next:], rows))
+        self._next = 0
+        return True
+
+    def take(self):
+        """(kind, mode, mode_left, dx, absolute_x, move_dir, move_range) of the next slot."""
+        if not len(self):
+            self.prefetch()
+        row = self._rows[self._next].item()
+        self._next += 1
+        return row
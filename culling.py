@@ -0,0 +1,96 @@
+import numpy as np
+
+
+def perspective(fovy, aspect, near, far):
+    """The projection matrix gluPerspective builds, row-major."""
+    f = 1.0 / np.tan(np.radians(fovy) / 2.0)
+    return np.array([
+        [f / aspect, 0.0, 0.0, 0.0],
+        [0.0, f, 0.0, 0.0],
+        [0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)],
+        [0.0, 0.0, -1.0, 0.0],
+    ])
+
+
+def look_at(eye, target, up):
+    """The view matrix gluLookAt builds, row-major."""
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side /= np.linalg.norm(side)
+    up = np.cross(side, forward)
+    view = np.identity(4)
+    view[0, :3], view[1, :3], view[2, :3] = side, up, -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+class Frustum:
+    """The camera's view frustum, for dropping entities before they are drawn.
+
+    set_camera() takes the same parameters as the gluPerspective and
+    gluLookAt calls that place the camera and derives the six clip planes
+    from their product. cull() tests a batch of bounding spheres against
+    them, and against `max_distance` from the eye when set, and returns a
+    mask of the ones that may be seen.
+
+    Each cull() call is counted under its name, as entities considered
+    against entities drawn, for the current frame and the whole session.
+    Until a camera is set, nothing is culled.
+    """
+
+    def __init__(self, max_distance=None):
+        self.max_distance = max_distance
+        self.planes = None
+        self.eye = np.zeros(3)
+        self.counts = {}
+        self.totals = {}
+
+    def set_camera(self, fovy, aspect, near, far, eye, target, up=(0.0, 1.0, 0.0)):
+        """Moves the frustum to the new camera and starts counting a new frame."""
+        clip = perspective(fovy, aspect, near, far) @ look_at(eye, target, up)
+        planes = np.array([clip[3] + clip[0], clip[3] - clip[0],
+                           clip[3] + clip[1], clip[3] - clip[1],
+                           clip[3] + clip[2], clip[3] - clip[2]])
+        self.planes = planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        self.eye = np.asarray(eye, dtype=np.float64)
+        self.counts = {}
+
+    def visible(self, centers, radii):
+        """Mask of the spheres at `centers` ((n, 3)) with `radii` that touch the frustum."""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+        if self.planes is None:
+            return np.ones(len(centers), dtype=bool)
+        distances = centers @ self.planes[:, :3].T + self.planes[:, 3]
+        mask = (distances >= -radii[:, None]).all(axis=1)
+        if self.max_distance is not None:
+            offsets = centers - self.eye
+            mask &= np.einsum('ij,ij->i', offsets, offsets) <= (self.max_distance + radii) ** 2
+        return mask
+
+    def cull(self, name, centers, radii):
+        """visible(), with the result counted under `name`."""
+        mask = self.visible(centers, radii)
+        considered, drawn = len(mask), int(np.count_nonzero(mask))
+        frame = self.counts.setdefault(name, [0, 0])
+        frame[0] += considered
+        frame[1] += drawn
+        total = self.totals.setdefault(name, [0, 0])
+        total[0] += considered
+        total[1] += drawn
+        return mask
+
+    def overlay_lines(self):
+        """Drawn / considered per entity kind in the current frame."""
+        return ["drawn: " + "  ".join(f"{name} {drawn}/{considered}"
+                                      for name, (considered, drawn) in self.counts.items())]
+
+    def report(self):
+        """Session totals per entity kind, for printing at exit."""
+        lines = []
+        for name, (considered, drawn) in sorted(self.totals.items()):
+            culled = 100.0 * (considered - drawn) / considered if considered else 0.0
+            lines.append(f"  {name:<12} {drawn:9d} drawn of {considered:9d} ({culled:4.1f}% culled)")
+        return ["Frustum culling:"] + lines if lines else []
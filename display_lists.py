@@ -0,0 +1,31 @@
+from OpenGL.GL import *
+
+
+class DisplayListCache:
+    """Compiles static models into GL display lists, one per variant key.
+
+    The first draw of a key runs its builder inside glNewList/glEndList;
+    every later draw is a single glCallList. Lists live until release_all().
+    """
+
+    def __init__(self, builder):
+        self._builder = builder
+        self._lists = {}
+
+    def draw(self, key):
+        display_list = self._lists.get(key)
+        if display_list is None:
+            display_list = glGenLists(1)
+            glNewList(display_list, GL_COMPILE)
+            self._builder(key)
+            glEndList()
+            self._lists[key] = display_list
+        glCallList(display_list)
+
+    def live_count(self):
+        return len(self._lists)
+
+    def release_all(self):
+        for display_list in self._lists.values():
+            glDeleteLists(display_list, 1)
+        self._lists.clear()
@@ -0,0 +1,85 @@
+SAFE_COLOR = (0.5, 0.5, 0.5)
+MOVING_COLOR = (0.0, 0.8, 1.0)
+TRAP_COLOR = (0.8, 0.2, 0.2)
+COCONUT_COLOR = (0.7, 0.5, 0.2)
+FRENZY_COLOR = (0.8, 0.8, 0.0)
+POWER_UP_COLOR = (0.6, 0.0, 0.8)
+BOAT_DOCK_COLOR = (0.4, 0.2, 0.0)
+EXIT_DOCK_COLOR = (0.2, 0.6, 0.2)
+
+TILE_TYPES = ('safe', 'moving', 'trap', 'coconut', 'power_up', 'boat_dock', 'exit_dock')
+
+
+class Tile:
+    """One stepping tile. Fields that only apply to some tile types keep neutral defaults."""
+    __slots__ = ('x', 'y', 'z', 'size', 'type', 'color', 'origin_x', 'player_on_tile', 'seq',
+                 'move_dir', 'move_range', 'move_speed', 'move_start', 'move_low', 'move_high',
+                 'is_active', 'pulse_start_time', 'fuse', 'tree_shot')
+
+    def __init__(self, x, y, z, size, type, color, origin_x=None):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.size = size
+        self.type = type
+        self.color = color
+        self.origin_x = x if origin_x is None else origin_x
+        self.player_on_tile = False
+        self.seq = -1
+        # Moving tiles
+        self.move_dir = 0
+        self.move_range = 0.0
+        self.move_speed = 0.0
+        self.move_start = 0.0
+        self.move_low = self.move_high = self.x
+        # Trap tiles
+        self.is_active = False
+        self.pulse_start_time = 0.0
+        self.fuse = None
+        # Coconut tiles
+        self.tree_shot = False
+
+    def x_at(self, time):
+        """Centre X at simulated `time`.
+
+        A moving tile leaves origin_x at move_start heading move_dir and
+        bounces between move_low and move_high, so its position is a
+        triangle wave of time that can be read for any moment directly.
+        """
+        if self.type != 'moving':
+            return self.x
+        span = self.move_high - self.move_low
+        if span <= 0:
+            return self.move_low
+        travelled = (self.origin_x - self.move_low) + self.move_dir * self.move_speed * (time - self.move_start)
+        offset = travelled % (2 * span)
+        return self.move_low + (offset if offset <= span else 2 * span - offset)
+
+    def contains(self, x, z, time=None):
+        half = self.size / 2
+        tile_x = self.x if time is None else self.x_at(time)
+        return abs(x - tile_x) < half and abs(z - self.z) < half
+
+
+class Obstacle:
+    """A rock in the river during boat mode."""
+    __slots__ = ('x', 'y', 'z', 'size', 'passed')
+
+    def __init__(self, x, y, z, size):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.size = size
+        self.passed = False
+
+
+class BoatCoconut:
+    """A floating coconut that can be shot or rammed in boat mode."""
+    __slots__ = ('x', 'y', 'z', 'radius', 'collected')
+
+    def __init__(self, x, y, z, radius=5.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.radius = radius
+        self.collected = False
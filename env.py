@@ -0,0 +1,231 @@
+import math
+import numpy as np
+import simulation as sim
+from clock import run_virtual
+from entities import FRENZY_COLOR, TILE_TYPES
+
+# Discrete actions, as the keys of the windowed game would press them
+DISCRETE_ACTIONS = ('noop', 'aim_left', 'aim_right', 'click', 'toggle_shooting', 'strafe_left', 'strafe_right')
+# Continuous actions: (aim in degrees, strafe in [-1, 1], click if > 0, toggle shooting if > 0)
+CONTINUOUS_ACTION_SIZE = 4
+
+PLAYER_FEATURES = 10 + len(sim.GAME_STATES)
+TILE_FEATURES = 8 + len(TILE_TYPES)
+OBSTACLE_FEATURES = 4
+COCONUT_FEATURES = 3
+TIMER_FEATURES = 5
+
+
+def observation_size(tiles=4, obstacles=3, coconuts=2):
+    return (PLAYER_FEATURES + tiles * TILE_FEATURES + obstacles * OBSTACLE_FEATURES
+            + coconuts * COCONUT_FEATURES + TIMER_FEATURES)
+
+
+def observe(state, out, tiles=4, obstacles=3, coconuts=2):
+    """Writes the observation of `state` into the float32 row `out`.
+
+    Layout: the player block, the next `tiles` jump targets, the closest
+    `obstacles` rocks and `coconuts` floating coconuts ahead of the boat,
+    then the timers. Positions are relative to the player and scaled by
+    the river width or the jump distance, so most values stay within
+    [-2, 2]. Missing tiles, rocks and coconuts are all zeros, with their
+    first "present" feature at 0.
+    """
+    player_x, player_y, player_z = state.player_pos
+    angle = math.radians(state.arrow_angle)
+    values = [player_x / sim.RIVER_WIDTH, player_y / sim.PLAYER_JUMP_HEIGHT, math.sin(angle), math.cos(angle)]
+    values.extend(1.0 if state.phase == phase else 0.0 for phase in sim.GAME_STATES)
+    values += [float(state.shooting_mode), float(state.picked_power_up), float(state.purple_tile_active),
+               float(state.frenzy_mode), float(state.autoplay_active), state.score / 100.0]
+
+    track = state.tiles
+    first = track.first_seq if track.current_seq is None else track.current_seq + 1
+    now = state.time
+    for seq in range(first, first + tiles):
+        tile = track.by_seq(seq)
+        if tile is None:
+            values.extend([0.0] * TILE_FEATURES)
+            continue
+        tile_x = tile.x_at(now)
+        velocity = (tile.x_at(now + sim.FIXED_DT) - tile_x) / sim.FIXED_DT
+        values += [1.0, (tile_x - player_x) / sim.RIVER_WIDTH, (tile.z - player_z) / sim.JUMP_DISTANCE,
+                   tile.size / sim.TILE_SIZE, velocity / 100.0]
+        values.extend(1.0 if tile.type == kind else 0.0 for kind in TILE_TYPES)
+        values += [float(tile.color == FRENZY_COLOR), float(tile.tree_shot), float(tile.is_active)]
+
+    ahead = sorted((obs for obs in state.obstacles if obs.z < player_z), key=lambda obs: -obs.z)
+    for index in range(obstacles):
+        if index < len(ahead):
+            obs = ahead[index]
+            values += [1.0, (obs.x - player_x) / sim.RIVER_WIDTH, (obs.z - player_z) / sim.OBSTACLE_VERTICAL_SPACING,
+                       obs.size / sim.TILE_SIZE]
+        else:
+            values.extend([0.0] * OBSTACLE_FEATURES)
+    ahead = sorted((coco for coco in state.boat_coconuts if coco.z < player_z), key=lambda coco: -coco.z)
+    for index in range(coconuts):
+        if index < len(ahead):
+            coco = ahead[index]
+            values += [1.0, (coco.x - player_x) / sim.RIVER_WIDTH, (coco.z - player_z) / sim.OBSTACLE_VERTICAL_SPACING]
+        else:
+            values.extend([0.0] * COCONUT_FEATURES)
+
+    current = track.current
+    fuse = current.fuse if current is not None else None
+    collapse = state.frenzy_collapse
+    jump_duration = sim.POWER_UP_JUMP_DURATION if state.picked_power_up else sim.PLAYER_JUMP_DURATION
+    values += [
+        max(0.0, fuse.due - now) / sim.TRAP_FUSE_TIME if fuse is not None else 0.0,
+        max(0.0, collapse.due - now) / sim.FRENZY_COLLAPSE_TIME if collapse is not None else 0.0,
+        sim.tiles_left(state, state.picked_power_up_expiry) / sim.MAX_PICKED_POWER_UP_TILES,
+        sim.tiles_left(state, state.purple_tile_expiry) / sim.MAX_PURPLE_AFFECTED_TILES,
+        min((now - state.jump_start_time) / jump_duration, 1.0) if state.phase == 'JUMPING' else 0.0,
+    ]
+    out[:] = values
+    return out
+
+
+def action_inputs(action):
+    """Inputs for a discrete action index or a continuous action vector."""
+    inputs = sim.Inputs()
+    if np.ndim(action) == 0:
+        name = DISCRETE_ACTIONS[int(action)]
+        if name == 'aim_left':
+            inputs.aim = sim.AIM_STEP
+        elif name == 'aim_right':
+            inputs.aim = -sim.AIM_STEP
+        elif name == 'click':
+            inputs.click = True
+        elif name == 'toggle_shooting':
+            inputs.toggle_shooting = True
+        elif name == 'strafe_left':
+            inputs.strafe = -1.0
+        elif name == 'strafe_right':
+            inputs.strafe = 1.0
+        return inputs
+    aim, strafe, click, toggle_shooting = (float(value) for value in action)
+    inputs.aim = max(-180.0, min(180.0, aim))
+    inputs.strafe = max(-1.0, min(1.0, strafe))
+    inputs.click = click > 0
+    inputs.toggle_shooting = toggle_shooting > 0
+    return inputs
+
+
+class IslandJumperEnv:
+    """One headless game behind a reset()/step() interface for learning agents.
+
+    step() takes a discrete action index (see DISCRETE_ACTIONS) or a
+    continuous action vector, plays it for `frame_skip` fixed steps and
+    returns (observation, reward, terminated, truncated, info) like a Gym
+    environment. Aim and strafe repeat on every skipped frame, clicks and
+    toggles only happen on the first. The reward is the change in score;
+    the episode terminates at game over and is truncated after `max_steps`
+    calls to step().
+    """
+
+    def __init__(self, frame_skip=1, max_steps=None, tiles=4, obstacles=3, coconuts=2):
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.layout = dict(tiles=tiles, obstacles=obstacles, coconuts=coconuts)
+        self.observation_size = observation_size(tiles, obstacles, coconuts)
+        self.action_count = len(DISCRETE_ACTIONS)
+        self.state = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        self.state = sim.new_game(verbose=False, seed=seed)
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def observe(self, out=None):
+        if out is None:
+            out = np.empty(self.observation_size, dtype=np.float32)
+        return observe(self.state, out, **self.layout)
+
+    def info(self):
+        state = self.state
+        return {'seed': state.seed, 'score': state.score, 'time': state.time,
+                'phase': state.phase, 'cause': state.cause_of_death}
+
+    def advance(self, action):
+        """Plays one action; returns (reward, terminated, truncated) without observing."""
+        state = self.state
+        score = state.score
+        pressed = action_inputs(action)
+        held = sim.Inputs()
+        held.aim, held.strafe = pressed.aim, pressed.strafe
+        frames = iter([pressed])
+
+        def play(dt):
+            sim.step(state, dt, next(frames, held))
+
+        run_virtual(play, sim.FIXED_DT, self.frame_skip, done=lambda: state.phase == 'GAME_OVER')
+        self.steps += 1
+        terminated = state.phase == 'GAME_OVER'
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return float(state.score - score), terminated, truncated
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        return self.observe(), reward, terminated, truncated, self.info()
+
+
+class VectorEnv:
+    """N independent games stepped in lockstep, with NumPy arrays in and out.
+
+    step() takes an (N,) array of discrete actions or an (N, 4) array of
+    continuous ones and returns the (N, observation_size) observations and
+    (N,) rewards, terminated and truncated flags. Observations are written
+    into one preallocated array, which is returned each call, so copy it
+    if it must outlive the next step. Finished games are reset at once
+    with the next unused seed; their final score is in info['final_score']
+    and their final observation in info['final_observation'].
+
+    Only the interface is batched: the games are still advanced one after
+    another by a Python loop over IslandJumperEnv.advance().
+    """
+
+    def __init__(self, num_envs, seed=0, **env_options):
+        self.envs = [IslandJumperEnv(**env_options) for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.observation_size = self.envs[0].observation_size
+        self.action_count = self.envs[0].action_count
+        self.seed = seed
+        self.next_seed = seed
+        self.observations = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+
+    def _reset_env(self, index):
+        env = self.envs[index]
+        env.reset(self.next_seed)
+        self.next_seed += 1
+        env.observe(self.observations[index])
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.next_seed = self.seed
+        for index in range(self.num_envs):
+            self._reset_env(index)
+        self.scores[:] = 0
+        return self.observations, {'score': self.scores}
+
+    def step(self, actions):
+        final_scores = np.full(self.num_envs, -1, dtype=np.int64)
+        final_observations = {}
+        for index, env in enumerate(self.envs):
+            reward, terminated, truncated = env.advance(actions[index])
+            self.rewards[index] = reward
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            if terminated or truncated:
+                final_scores[index] = env.state.score
+                final_observations[index] = env.observe()
+                self._reset_env(index)
+            else:
+                env.observe(self.observations[index])
+            self.scores[index] = env.state.score
+        info = {'score': self.scores, 'final_score': final_scores, 'final_observation': final_observations}
+        return self.observations, self.rewards, self.terminated, self.truncated, info
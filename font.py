@@ -0,0 +1,154 @@
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+
+# Printable ASCII; anything else is drawn as '?'
+CHARS = ''.join(chr(code) for code in range(32, 127))
+COLUMNS = 16
+
+
+class FontAtlas:
+    """A GLUT bitmap font rasterised once into an alpha texture.
+
+    build() draws every glyph of `chars` with glutBitmapCharacter into a
+    grid in the back buffer, reads it back with glReadPixels and uploads
+    it as one GL_ALPHA texture, then records each glyph's advance width.
+    It needs a current GL context and a mapped window, so call it at the
+    start of a frame, before the buffer is cleared for drawing.
+
+    draw_lines() lays out any number of strings with NumPy and draws all
+    their glyphs as one textured quad array, blended over the scene in
+    the current colour. Coordinates are those of the current projection,
+    normally window pixels under gluOrtho2D.
+    """
+
+    def __init__(self, font=GLUT_BITMAP_HELVETICA_18, line_height=24, descent=5, chars=CHARS):
+        self.font = font
+        self.line_height = line_height
+        self.descent = descent
+        self.chars = chars
+        self.texture = None
+        self.advance = np.zeros(256, dtype=np.float32)
+        self.glyph = np.zeros(256, dtype=np.intp)
+        self.texcoords = None
+        self.cell_width = 0
+
+    @property
+    def ready(self):
+        return self.texture is not None
+
+    def build(self):
+        font, chars = self.font, self.chars
+        widths = [glutBitmapWidth(font, ord(ch)) for ch in chars]
+        cell_w, cell_h = max(widths) + 2, self.line_height
+        rows = (len(chars) + COLUMNS - 1) // COLUMNS
+        width, height = COLUMNS * cell_w, rows * cell_h
+
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glViewport(0, 0, width, height)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, width, 0, height)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        glDisable(GL_DEPTH_TEST)
+        glDisable(GL_TEXTURE_2D)
+        glDisable(GL_BLEND)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glColor3f(1.0, 1.0, 1.0)
+        for index, ch in enumerate(chars):
+            column, row = index % COLUMNS, index // COLUMNS
+            glRasterPos2i(column * cell_w + 1, row * cell_h + self.descent)
+            glutBitmapCharacter(font, ord(ch))
+        glReadBuffer(GL_BACK)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        pixels = glReadPixels(0, 0, width, height, GL_RED, GL_UNSIGNED_BYTE)
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
+        glPopAttrib()
+        alpha = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width)
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_ALPHA, width, height, 0, GL_ALPHA, GL_UNSIGNED_BYTE,
+                     np.ascontiguousarray(alpha))
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        # Each glyph's quad covers its whole cell; the pen moves by the glyph's advance
+        self.cell_width = cell_w
+        index = np.arange(len(chars))
+        u0 = (index % COLUMNS) * cell_w / width
+        v0 = (index // COLUMNS) * cell_h / height
+        u1, v1 = u0 + cell_w / width, v0 + cell_h / height
+        self.texcoords = np.stack([np.stack([u0, v0], 1), np.stack([u1, v0], 1),
+                                   np.stack([u1, v1], 1), np.stack([u0, v1], 1)], 1).astype(np.float32)
+        fallback = chars.index('?') if '?' in chars else 0
+        self.glyph[:] = fallback
+        for i, ch in enumerate(chars):
+            self.glyph[ord(ch)] = i
+            self.advance[ord(ch)] = widths[i]
+        self.advance[[code for code in range(256) if chr(code) not in chars]] = widths[fallback]
+
+    def width(self, string):
+        """Width of `string` in pixels."""
+        codes = np.frombuffer(string.encode('latin-1', 'replace'), dtype=np.uint8)
+        return float(self.advance[codes].sum())
+
+    def layout(self, lines):
+        """(vertices, texcoords) arrays of the glyph quads for [(x, y, string), ...]."""
+        vertices, texcoords = [], []
+        for x, y, string in lines:
+            codes = np.frombuffer(string.encode('latin-1', 'replace'), dtype=np.uint8)
+            if not len(codes):
+                continue
+            pen = x - 1 + np.concatenate(([0.0], np.cumsum(self.advance[codes][:-1])))
+            bottom, top = y - self.descent, y - self.descent + self.line_height
+            right = pen + self.cell_width
+            quads = np.empty((len(codes), 4, 2), dtype=np.float32)
+            quads[:, 0, 0] = quads[:, 3, 0] = pen
+            quads[:, 1, 0] = quads[:, 2, 0] = right
+            quads[:, 0, 1] = quads[:, 1, 1] = bottom
+            quads[:, 2, 1] = quads[:, 3, 1] = top
+            vertices.append(quads.reshape(-1, 2))
+            texcoords.append(self.texcoords[self.glyph[codes]].reshape(-1, 2))
+        if not vertices:
+            return None, None
+        return np.concatenate(vertices), np.concatenate(texcoords)
+
+    def draw_lines(self, lines, color=(1.0, 1.0, 1.0)):
+        """Draws every (x, y, string) in one glDrawArrays call; y is the text baseline."""
+        vertices, texcoords = self.layout(lines)
+        if vertices is None:
+            return
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_TEXTURE_BIT | GL_CURRENT_BIT)
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glColor3f(*color)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        glDrawArrays(GL_QUADS, 0, len(vertices))
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopAttrib()
+
+    def draw(self, x, y, string, color=(1.0, 1.0, 1.0)):
+        self.draw_lines([(x, y, string)], color)
+
+    def release(self):
+        if self.texture is not None:
+            glDeleteTextures([self.texture])
+            self.texture = None
@@ -0,0 +1,74 @@
+import time
+
+
+class CpuMeter:
+    """Tracks the share of one core used by the process, per activity label.
+
+    sample() is called once per frame with a label such as 'game over' or
+    'active play'; the process CPU time and wall time since the previous
+    sample are credited to that label.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self._last_cpu = time.process_time()
+        self._last_wall = time.perf_counter()
+
+    def sample(self, label):
+        cpu, wall = time.process_time(), time.perf_counter()
+        totals = self.totals.setdefault(label, [0.0, 0.0])
+        totals[0] += cpu - self._last_cpu
+        totals[1] += wall - self._last_wall
+        self._last_cpu, self._last_wall = cpu, wall
+
+    def usage(self, label):
+        cpu, wall = self.totals.get(label, (0.0, 0.0))
+        return 100.0 * cpu / wall if wall > 0 else 0.0
+
+    def report(self):
+        lines = []
+        for label, (cpu, wall) in sorted(self.totals.items()):
+            lines.append(f"{label}: {self.usage(label):5.1f}% CPU over {wall:.1f}s")
+        return lines
+
+
+class FrameScheduler:
+    """Decides when to redraw and how long to sleep until the next frame.
+
+    In render-on-demand mode a frame is only drawn when something asked for
+    it (input, window events) or while an animation is running, plus one
+    final frame after the animation stops so the resting pose is shown.
+    """
+
+    def __init__(self, target_fps=60, on_demand=False):
+        self.target_fps = target_fps
+        self.on_demand = on_demand
+        self.redraw_requested = True
+        self.was_animating = False
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self._frame_start = time.perf_counter()
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def request_redraw(self):
+        self.redraw_requested = True
+
+    def should_draw(self, stepped, animating):
+        draw = (not self.on_demand or self.redraw_requested or
+                (stepped and (animating or self.was_animating)))
+        if stepped:
+            self.was_animating = animating
+            if draw:
+                self.redraw_requested = False
+        if draw:
+            self.frames_drawn += 1
+        else:
+            self.frames_skipped += 1
+        return draw
+
+    def delay_ms(self):
+        """Milliseconds left in this frame's budget, for glutTimerFunc."""
+        elapsed = time.perf_counter() - self._frame_start
+        return max(0, int((1.0 / self.target_fps - elapsed) * 1000))
@@ -0,0 +1,115 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+
+
+def text(x, y, string, font=GLUT_BITMAP_HELVETICA_18, color=(1.0, 1.0, 1.0)):
+    """Issues one line of bitmap text at window position (x, y); no matrix changes."""
+    glColor3f(*color)
+    glRasterPos2f(x, y)
+    for ch in string:
+        glutBitmapCharacter(font, ord(ch))
+
+
+class Widget:
+    """One HUD element.
+
+    value(state) reads what the widget shows and returns it as a plain,
+    comparable value, or None to hide the widget. build(value) issues the
+    GL calls that draw it; they are compiled into the widget's display
+    list and only rebuilt when the value changes.
+    """
+    __slots__ = ('name', 'value', 'build', 'display_list', 'shown', 'rebuilds')
+
+    def __init__(self, name, value, build):
+        self.name = name
+        self.value = value
+        self.build = build
+        self.display_list = None
+        self.shown = None
+        self.rebuilds = 0
+
+
+class Hud:
+    """Retained-mode HUD drawn from cached display lists.
+
+    Each frame, draw() asks every widget for its current value. Widgets
+    whose value changed are recompiled; then all visible widgets are
+    composited in one pass under a single 2D projection, with depth
+    testing off so the HUD always sits on top. Widget values are computed
+    from the game state without changing it.
+
+    Text goes through `font`, a FontAtlas, once it is built; until then
+    it falls back to glutBitmapCharacter.
+    """
+
+    def __init__(self, width, height, font=None):
+        self.width = width
+        self.height = height
+        self.font = font
+        self.widgets = []
+
+    def set_font(self, font):
+        """Switches the text font; every widget is recompiled on its next draw."""
+        self.font = font
+        for widget in self.widgets:
+            widget.rebuilds = 0
+
+    def text(self, x, y, string, color=(1.0, 1.0, 1.0)):
+        if self.font is not None and self.font.ready:
+            self.font.draw(x, y, string, color)
+        else:
+            text(x, y, string, color=color)
+
+    def add(self, name, value, build):
+        widget = Widget(name, value, build)
+        self.widgets.append(widget)
+        return widget
+
+    def add_text(self, name, x, y, value):
+        """A single line of text; value(state) returns the string, or None to hide it."""
+        return self.add(name, value, lambda string: self.text(x, y, string))
+
+    def _compile(self, widget, value):
+        if widget.display_list is None:
+            widget.display_list = glGenLists(1)
+        glNewList(widget.display_list, GL_COMPILE)
+        widget.build(value)
+        glEndList()
+        widget.shown = value
+        widget.rebuilds += 1
+
+    def draw(self, state):
+        visible = []
+        for widget in self.widgets:
+            value = widget.value(state)
+            if value is None:
+                continue
+            if widget.rebuilds == 0 or value != widget.shown:
+                self._compile(widget, value)
+            visible.append(widget.display_list)
+        if not visible:
+            return
+
+        glDisable(GL_DEPTH_TEST)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, self.width, 0, self.height)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        for display_list in visible:
+            glCallList(display_list)
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glEnable(GL_DEPTH_TEST)
+
+    def release_all(self):
+        for widget in self.widgets:
+            if widget.display_list is not None:
+                glDeleteLists(widget.display_list, 1)
+                widget.display_list = None
+            widget.rebuilds = 0
@@ -0,0 +1,148 @@
+import functools
+import time
+from array import array
+from collections import deque
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class _Section:
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler.exit()
+
+
+class _NoSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+NO_SECTION = _NoSection()
+
+
+class FrameProfiler:
+    """Times the phases of each frame with perf_counter_ns.
+
+    Code marks a phase with `with profiler.section(name):` or the
+    @profiler.timed(name) decorator. Sections may nest; each phase is
+    charged only for its own time, not for the sections inside it, so
+    the phases of a frame add up to the frame's total. next_frame()
+    closes the current frame and starts the next one.
+
+    The last `window` frames are kept for the overlay graph and its
+    percentiles. Every frame is also kept for the whole session, at 8
+    bytes per phase per frame, for report(). With a `tracer` attached,
+    every section is also sent to it as a span, whether or not the
+    overlay is enabled. While disabled and without a tracer, sections
+    cost a couple of attribute checks and nothing is recorded.
+    """
+
+    def __init__(self, window=240, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.tracer = None
+        self.frames = deque(maxlen=window)
+        self.recent = {}
+        self.session = {}
+        self.session_frames = array('q')
+        self._stack = []
+        self._current = {}
+
+    def section(self, name):
+        return _Section(self, name) if self.enabled or self.tracer is not None else NO_SECTION
+
+    def timed(self, name):
+        """Decorator that runs the whole function as one section."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled and self.tracer is None:
+                    return fn(*args, **kwargs)
+                self.enter(name)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.exit()
+            return wrapper
+        return decorate
+
+    def enter(self, name):
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if stack:
+            parent = stack[-1]
+            self._current[parent[0]] = self._current.get(parent[0], 0) + now - parent[1]
+        # Name, when the section last resumed and when it started
+        stack.append([name, now, now])
+
+    def exit(self):
+        now = time.perf_counter_ns()
+        stack = self._stack
+        name, resumed, start = stack.pop()
+        self._current[name] = self._current.get(name, 0) + now - resumed
+        if stack:
+            stack[-1][1] = now
+        if self.tracer is not None:
+            self.tracer.span(name, start, now)
+
+    def next_frame(self):
+        """Records the frame that just ended, if anything was timed in it."""
+        current = self._current
+        self._current = {}
+        if not current or not self.enabled:
+            return
+        total = sum(current.values())
+        self.frames.append(total)
+        self.session_frames.append(total)
+        for name, ns in current.items():
+            recent = self.recent.get(name)
+            if recent is None:
+                recent = self.recent[name] = deque(maxlen=self.window)
+                self.session[name] = array('q')
+            recent.append(ns)
+            self.session[name].append(ns)
+
+    def frame_times_ms(self):
+        """Totals of the frames in the window, oldest first, in milliseconds."""
+        return [ns / 1e6 for ns in self.frames]
+
+    def stats(self, samples):
+        """(p50, p95, p99, max) of nanosecond samples, in milliseconds."""
+        values = np.asarray(samples, dtype=np.float64) / 1e6
+        return (*np.percentile(values, PERCENTILES), values.max())
+
+    def overlay_lines(self):
+        """One line per phase over the window, slowest p95 first."""
+        if not self.frames:
+            return ["profiler: waiting for frames"]
+        p50, p95, p99, worst = self.stats(self.frames)
+        lines = [f"{'ms':<12}{'p50':>7}{'p95':>7}{'p99':>7}", f"{'frame':<12}{p50:7.2f}{p95:7.2f}{p99:7.2f}"]
+        rows = [(name, self.stats(recent)) for name, recent in self.recent.items() if recent]
+        for name, (p50, p95, p99, worst) in sorted(rows, key=lambda row: -row[1][1]):
+            lines.append(f"{name:<12}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        return lines
+
+    def report(self):
+        """Session summary per phase, for printing at exit."""
+        if not self.session_frames:
+            return []
+        lines = [f"Profiled frames: {len(self.session_frames)} (p50 / p95 / p99 / max ms)"]
+        rows = [('frame', self.session_frames)] + sorted(self.session.items())
+        for name, samples in rows:
+            p50, p95, p99, worst = self.stats(samples)
+            lines.append(f"  {name:<12} {p50:7.3f} {p95:7.3f} {p99:7.3f} {worst:8.3f}  ({len(samples)} frames)")
+        return lines
@@ -0,0 +1,42 @@
+from OpenGL.GLU import *
+
+
+class QuadricPool:
+    """Owns the GLU quadrics shared by every model drawer.
+
+    gluNewQuadric() allocates a native object that is never garbage collected,
+    so the drawers ask the pool for a named quadric instead. Each name is
+    created once, configured once, and lives until release_all() is called
+    when the GL context goes away.
+    """
+
+    def __init__(self):
+        self._quadrics = {}
+        self.created = 0
+        self.deleted = 0
+
+    def get(self, name='solid', draw_style=GLU_FILL, normals=GLU_SMOOTH):
+        quadric = self._quadrics.get(name)
+        if quadric is None:
+            quadric = gluNewQuadric()
+            gluQuadricDrawStyle(quadric, draw_style)
+            gluQuadricNormals(quadric, normals)
+            self._quadrics[name] = quadric
+            self.created += 1
+        return quadric
+
+    def live_count(self):
+        return len(self._quadrics)
+
+    def stats(self):
+        return {'live': self.live_count(), 'created': self.created, 'deleted': self.deleted}
+
+    def release_all(self):
+        """Frees every quadric. Call only while the GL context is still current."""
+        for quadric in self._quadrics.values():
+            gluDeleteQuadric(quadric)
+            self.deleted += 1
+        self._quadrics.clear()
+
+
+quadric_pool = QuadricPool()
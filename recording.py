@@ -0,0 +1,215 @@
+import argparse
+import struct
+import time
+import simulation as sim
+from clock import run_virtual
+
+MAGIC = b'IJR1'
+# Magic, session seed, visible tiles, fixed step
+HEADER = struct.Struct('<4sQHd')
+EXACT = struct.Struct('<d')
+
+# Event flag bits; an event with no flags marks the end of the recording
+CLICK = 0x01
+TOGGLE_AUTOPLAY = 0x02
+TOGGLE_SHOOTING = 0x04
+RESTART = 0x08
+AIM_STEPS = 0x10
+AIM_EXACT = 0x20
+STRAFE_STEPS = 0x40
+STRAFE_EXACT = 0x80
+
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _small_int(value):
+    """value as a signed byte if it is a whole number that fits, else None."""
+    if value == int(value) and -128 <= value <= 127:
+        return int(value)
+    return None
+
+
+class Recorder:
+    """Writes the inputs of every simulation step to a compact binary file.
+
+    The header holds the session seed, the track window and the fixed
+    step. After that, each step with any input becomes one event: the
+    number of steps since the previous event as a varint, a flag byte,
+    then the aim and strafe if present. Aim is stored as a signed count
+    of AIM_STEP and strafe as a signed byte when they are whole, as
+    keyboard input always is, and as exact doubles otherwise, so a bot's
+    arbitrary angles replay bit for bit. A keyboard event takes 2-4 bytes.
+    """
+
+    def __init__(self, path, seed, visible_tiles=sim.VISIBLE_TILES, dt=sim.FIXED_DT):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, seed, visible_tiles, dt))
+        self.frame = 0
+        self.last_event = 0
+        self.events = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, inputs):
+        """Logs the inputs passed to the next step; call once per step, with None for no input."""
+        if inputs is not None:
+            flags = ((CLICK if inputs.click else 0) | (TOGGLE_AUTOPLAY if inputs.toggle_autoplay else 0)
+                     | (TOGGLE_SHOOTING if inputs.toggle_shooting else 0) | (RESTART if inputs.restart else 0))
+            payload = bytearray()
+            if inputs.aim:
+                steps = _small_int(inputs.aim / sim.AIM_STEP)
+                if steps is not None and steps * sim.AIM_STEP == inputs.aim:
+                    flags |= AIM_STEPS
+                    payload += struct.pack('<b', steps)
+                else:
+                    flags |= AIM_EXACT
+                    payload += EXACT.pack(inputs.aim)
+            if inputs.strafe:
+                strafe = _small_int(inputs.strafe)
+                if strafe is not None:
+                    flags |= STRAFE_STEPS
+                    payload += struct.pack('<b', strafe)
+                else:
+                    flags |= STRAFE_EXACT
+                    payload += EXACT.pack(inputs.strafe)
+            if flags:
+                event = bytearray()
+                _write_varint(event, self.frame - self.last_event)
+                event.append(flags)
+                self.file.write(event + payload)
+                self.last_event = self.frame
+                self.events += 1
+        self.frame += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        # The end marker records how many steps the session ran
+        event = bytearray()
+        _write_varint(event, self.frame - self.last_event)
+        event.append(0)
+        self.file.write(event)
+        self.file.close()
+
+
+class Recording:
+    """A recorded session read back into memory: its header and (step, Inputs) events."""
+
+    def __init__(self, seed, visible_tiles, dt, events, frames):
+        self.seed = seed
+        self.visible_tiles = visible_tiles
+        self.dt = dt
+        self.events = events
+        self.frames = frames
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, seed, visible_tiles, dt = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an Island Jumper recording")
+        offset, frame, events = HEADER.size, 0, []
+        while offset < len(data):
+            delta, offset = _read_varint(data, offset)
+            frame += delta
+            flags = data[offset]
+            offset += 1
+            if not flags:
+                return cls(seed, visible_tiles, dt, events, frame)
+            inputs = sim.Inputs()
+            inputs.click = bool(flags & CLICK)
+            inputs.toggle_autoplay = bool(flags & TOGGLE_AUTOPLAY)
+            inputs.toggle_shooting = bool(flags & TOGGLE_SHOOTING)
+            inputs.restart = bool(flags & RESTART)
+            if flags & AIM_STEPS:
+                inputs.aim = struct.unpack_from('<b', data, offset)[0] * sim.AIM_STEP
+                offset += 1
+            elif flags & AIM_EXACT:
+                inputs.aim = EXACT.unpack_from(data, offset)[0]
+                offset += EXACT.size
+            if flags & STRAFE_STEPS:
+                inputs.strafe = float(struct.unpack_from('<b', data, offset)[0])
+                offset += 1
+            elif flags & STRAFE_EXACT:
+                inputs.strafe = EXACT.unpack_from(data, offset)[0]
+                offset += EXACT.size
+            events.append((frame, inputs))
+        # Cut off before the end marker: replay what was written
+        return cls(seed, visible_tiles, dt, events, frame)
+
+    def new_state(self, verbose=False):
+        """A fresh game set up exactly as the recorded one was."""
+        state = sim.GameState(verbose=verbose, visible_tiles=self.visible_tiles, seed=self.seed)
+        sim.reset_game(state)
+        return state
+
+
+class Replayer:
+    """Hands out the recorded inputs one simulation step at a time."""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.frame = 0
+        self._next_event = 0
+
+    @property
+    def finished(self):
+        return self.frame >= self.recording.frames
+
+    def inputs(self):
+        """Inputs for the next step, or None if nothing was pressed on it."""
+        events = self.recording.events
+        inputs = None
+        if self._next_event < len(events) and events[self._next_event][0] == self.frame:
+            inputs = events[self._next_event][1]
+            self._next_event += 1
+        self.frame += 1
+        return inputs
+
+    def run(self, state):
+        """Plays the rest of the recording on `state` as fast as the CPU allows."""
+        remaining = self.recording.frames - self.frame
+        run_virtual(lambda dt: sim.step(state, dt, self.inputs()), self.recording.dt, remaining)
+        return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an Island Jumper recording headless at full speed.")
+    parser.add_argument('recording')
+    parser.add_argument('--verbose', action='store_true', help="print the game's messages while replaying")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    state = recording.new_state(verbose=args.verbose)
+    start = time.perf_counter()
+    Replayer(recording).run(state)
+    elapsed = time.perf_counter() - start
+    print(f"seed {recording.seed}: {recording.frames} steps, {len(recording.events)} input events")
+    print(f"final score {state.score}, phase {state.phase}, {state.tile_count} tiles, {state.time:.1f}s simulated")
+    print(f"replayed in {elapsed:.3f}s ({recording.frames / max(elapsed, 1e-9):.0f} steps/s, "
+          f"{recording.frames * recording.dt / max(elapsed, 1e-9):.0f}x real time)")
+
+if __name__ == "__main__":
+    main()
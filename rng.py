@@ -0,0 +1,65 @@
+import secrets
+import numpy as np
+
+# Stream names in a fixed order; a stream's index is part of its seed, so
+# adding a name at the end never changes the numbers of the existing ones.
+STREAM_NAMES = ('course', 'modes', 'obstacles', 'coconuts', 'boat_exit')
+
+
+def new_seed():
+    """A fresh 63-bit session seed."""
+    return secrets.randbits(63)
+
+
+class RandomStream:
+    """One independent generator that hands out numbers from pre-filled blocks.
+
+    A PCG64 generator fills `block_size` uniform doubles at a time; random(),
+    uniform(), randint() and choice() then only take the value at the block
+    index and advance it. Every method consumes exactly one value, so the
+    sequence a subsystem sees depends only on its own calls.
+    """
+
+    def __init__(self, seed_sequence, block_size=256):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.block_size = block_size
+        self._block = []
+        self._index = 0
+
+    def block_left(self):
+        """The values of the current block that have not been handed out yet."""
+        return self._block[self._index:]
+
+    def set_block(self, values):
+        """Makes `values` the rest of the current block, as block_left() returned them."""
+        self._block = list(values)
+        self._index = 0
+
+    def random(self):
+        """A float in [0, 1)."""
+        index = self._index
+        if index == len(self._block):
+            self._block = self.generator.random(self.block_size).tolist()
+            index = 0
+        self._index = index + 1
+        return self._block[index]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """An integer in [a, b], both ends included."""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+
+class RandomStreams:
+    """The per-subsystem streams of one session, all derived from `seed`."""
+
+    def __init__(self, seed=None, block_size=256):
+        self.seed = new_seed() if seed is None else seed
+        for index, name in enumerate(STREAM_NAMES):
+            sequence = np.random.SeedSequence(self.seed, spawn_key=(index,))
+            setattr(self, name, RandomStream(sequence, block_size))
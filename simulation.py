@@ -0,0 +1,785 @@
+import math
+from bullets import BulletPool
+from track import TileTrack
+from timers import TimerQueue
+from clock import run_virtual
+from rng import RandomStreams
+from course import CourseTable, CoursePlanner, CourseBuffer, SAFE, MOVING, TRAP, COCONUT, FRENZY, POWER_UP, BOAT_DOCK
+from entities import (
+    Tile, Obstacle, BoatCoconut, SAFE_COLOR, MOVING_COLOR, TRAP_COLOR, COCONUT_COLOR,
+    FRENZY_COLOR, POWER_UP_COLOR, BOAT_DOCK_COLOR, EXIT_DOCK_COLOR,
+)
+
+#Game Configuration & Constants
+PURPLE_TILE_DURATION = 5.0
+MAX_PURPLE_AFFECTED_TILES = 5
+MAX_PICKED_POWER_UP_TILES = 5
+
+PLAYER_JUMP_HEIGHT = 40.0
+PLAYER_JUMP_DURATION = 0.4
+POWER_UP_JUMP_DURATION = 0.09
+JUMP_DISTANCE = 150.0
+ARROW_LENGTH = 75.0
+TILE_SIZE = 60.0
+TILE_HEIGHT = 10.0
+RIVER_WIDTH = 200.0
+TRAP_PULSE_SPEED = 8.0
+TRAP_FUSE_TIME = 3.0
+DROWN_DURATION = 2.0
+BOAT_FORWARD_SPEED = 300.0
+BOAT_STRAFE_SPEED = 1500
+OBSTACLE_VERTICAL_SPACING = 350.0
+FRENZY_COLLAPSE_TIME = 2.0
+AIM_STEP = 4.0
+VISIBLE_TILES = 7
+
+# Simulation timestep; one strafe key press moves the boat for one step
+FIXED_DT = 1/60.0
+
+# Tile-based progression system. "tiles" weights the tile kinds a mode
+# places; modes are picked with equal odds unless they give a "weight".
+game_modes = [
+    {"name": "purple_power", "duration": 1, "tiles": {"power_up": 1},
+     "description": "Purple power-up tile appears"},
+    {"name": "safe", "duration": 12, "tiles": {"safe": 1},
+     "description": "Safe tiles only"},
+    {"name": "moving", "duration": 8, "tiles": {"moving": 0.7, "safe": 0.3},
+     "description": "Moving tiles introduced"},
+    {"name": "mixed", "duration": 12, "tiles": {"moving": 0.4, "safe": 0.6},
+     "description": "Mixed safe and moving tiles"},
+    {"name": "frenzy", "duration": 10, "tiles": {"frenzy": 1}, "centered": True,
+     "description": "Frenzy mode - yellow tiles"},
+    {"name": "trap", "duration": 8, "tiles": {"trap": 0.4, "safe": 0.6},
+     "description": "Trap tiles introduced"},
+    {"name": "coconut", "duration": 10, "tiles": {"coconut": 0.5, "safe": 0.5},
+     "description": "Coconut trees"},
+    {"name": "chaos", "duration": 15, "tiles": {"trap": 0.2, "moving": 0.2, "coconut": 0.2, "safe": 0.4},
+     "description": "All tile types mixed"}
+]
+
+# A mode's coconut tree never follows a trap or another tree
+TILE_RULES = {"coconut": {"not_after": ("trap", "coconut"), "instead": "safe"}}
+# Coconut trees can also turn up in any mode, just not twice in a row
+WILD_TILE = {"kind": "coconut", "chance": 0.15, "not_after": ("coconut",)}
+COURSE_TABLE = CourseTable(game_modes, TILE_RULES, WILD_TILE)
+
+# Shooting system
+BULLET_SPEED = 70.0
+BULLET_MAX_DISTANCE = 60 * 7
+BULLET_HAND_X = 7
+BULLET_HAND_Y = 35.0
+
+# Boat coconut system
+MAX_BOAT_COCONUTS = 10
+
+# Tile type and colour for each planned course kind
+COURSE_TILES = {
+    SAFE: ('safe', SAFE_COLOR),
+    MOVING: ('moving', MOVING_COLOR),
+    TRAP: ('trap', TRAP_COLOR),
+    COCONUT: ('coconut', COCONUT_COLOR),
+    FRENZY: ('safe', FRENZY_COLOR),
+    POWER_UP: ('power_up', POWER_UP_COLOR),
+}
+
+GAME_STATES = ['AIMING', 'JUMPING', 'LANDED', 'DROWNING', 'BOAT_MODE', 'GAME_OVER']
+DEATH_CAUSES = ['trap', 'water', 'out_of_bounds', 'boat_collision', 'restart']
+
+class Inputs:
+    """Player input gathered between two simulation steps."""
+    def __init__(self):
+        self.aim = 0.0
+        self.strafe = 0.0
+        self.click = False
+        self.toggle_autoplay = False
+        self.toggle_shooting = False
+        self.restart = False
+
+class GameState:
+    """Everything the game logic reads or writes. Contains no OpenGL state."""
+    def __init__(self, verbose=True, visible_tiles=VISIBLE_TILES, seed=None):
+        self.verbose = verbose
+        # Every random draw comes from these streams; the seed regenerates the session
+        self.rng = RandomStreams(seed)
+        self.seed = self.rng.seed
+        self.time = 0.0
+        self.phase = 'AIMING'
+        self.cause_of_death = None
+        self.score = 0
+        self.player_pos = [0.0, TILE_HEIGHT / 2, 0.0]
+        self.player_angle = 0.0
+        self.arrow_angle = 0.0
+        self.autoplay_active = False
+        self.shooting_mode = False
+        self.fire_bullet = False
+        self.bullets = BulletPool(BULLET_SPEED, BULLET_MAX_DISTANCE)
+
+        # Jump animation
+        self.jump_start_pos = None
+        self.jump_end_pos = None
+        self.jump_start_time = 0.0
+        self.jump_anim_arm_angle = 0.0
+        self.jump_anim_leg_angle = 0.0
+        self.drown_start_time = 0.0
+
+        # Deadlines in simulated seconds (state.time) and in tiles generated
+        self.timers = TimerQueue()
+        self.tile_timers = TimerQueue()
+        self.tiles_generated = 0
+
+        # Course
+        self.course = None
+        self.tiles = TileTrack(visible_tiles)
+        self.start_seq = None
+        self.obstacles = []
+        self.obstacle_spawn_count = 0
+        self.tile_spawn_count = 0
+        self.tile_count = 0
+        self.current_game_mode = 0
+        self.mode_tiles_remaining = 0
+        self.frenzy_mode = False
+        self.last_jump_time = None
+        self.frenzy_collapse = None
+        self.armed_traps = []
+
+        # Power-ups, each expiring through a timer in tile_timers
+        self.picked_power_up = False
+        self.picked_power_up_expiry = None
+        self.purple_tile_active = False
+        self.purple_tile_start_time = 0
+        self.purple_tile_expiry = None
+
+        # Boat mode
+        self.boat_obstacles_passed = 0
+        self.boat_exit_generated = False
+        self.boat_coconuts = []
+        self.boat_coconuts_spawned = 0
+        self.boat_coconuts_collected = 0
+        self.boat_segments_completed = 0
+
+def announce(state, message):
+    if state.verbose:
+        print(message)
+
+def get_current_stage(state):
+    if state.phase == 'BOAT_MODE':
+        return "Boat Mode"
+    return "Endless Island Adventure"
+
+def reset_game(state):
+    state.timers.clear()
+    state.tile_timers.clear()
+    state.last_jump_time = None
+    state.frenzy_collapse = None
+    state.armed_traps.clear()
+    state.phase = 'AIMING'
+    state.cause_of_death = None
+    state.score = 0
+    state.boat_obstacles_passed = 0
+    state.boat_segments_completed = 0
+    state.boat_exit_generated = False
+    state.player_pos = [0.0, TILE_HEIGHT / 2, 0.0]
+    state.player_angle = 0.0
+    state.arrow_angle = 0.0
+    state.jump_anim_arm_angle = 0.0
+    state.jump_anim_leg_angle = 0.0
+    state.frenzy_mode = False
+    state.autoplay_active = False
+    state.shooting_mode = False
+    state.fire_bullet = False
+    state.bullets.clear()
+    state.boat_coconuts.clear()
+    state.boat_coconuts_spawned = 0
+    state.boat_coconuts_collected = 0
+    state.picked_power_up = False
+    state.picked_power_up_expiry = None
+    state.purple_tile_active = False
+    state.purple_tile_expiry = None
+    state.tiles.clear()
+    state.obstacles.clear()
+    state.obstacle_spawn_count = 0
+    state.tile_spawn_count = 0
+    state.tile_count = 0
+    state.current_game_mode = 0
+    state.mode_tiles_remaining = game_modes[0]["duration"]
+    state.course = new_course(state)
+
+    # Add initial tile
+    start_tile = Tile(0, 0, 0, TILE_SIZE, 'safe', SAFE_COLOR)
+    state.tiles.append(start_tile)
+    state.tiles.set_current(start_tile)
+    state.start_seq = start_tile.seq
+
+    # Generate initial tiles
+    for _ in range(3):
+        generate_new_tile(state)
+
+def end_game(state, cause):
+    """Ends the run; cause is one of DEATH_CAUSES."""
+    state.phase = 'GAME_OVER'
+    state.cause_of_death = cause
+
+def return_to_start(state):
+    """Puts the player back on the starting tile after a trap or a fall."""
+    player_pos = state.player_pos
+    player_pos[0], player_pos[2], player_pos[1] = 0.0, 0.0, TILE_HEIGHT/2
+    state.player_angle = 0.0
+    state.arrow_angle = 0.0
+    state.phase = 'AIMING'
+    state.tiles.set_current(state.tiles.by_seq(state.start_seq))
+
+def new_course(state):
+    planner = CoursePlanner(state.rng, COURSE_TABLE, TILE_SIZE, JUMP_DISTANCE, RIVER_WIDTH)
+    return CourseBuffer(planner)
+
+def get_current_game_mode(state):
+    return game_modes[state.current_game_mode]
+
+def generate_new_tile(state):
+    """Places the next planned tile of the course after the last one on the track."""
+    tiles = state.tiles
+
+    # Apply power-up effects; the tile that reaches an effect's limit still gets it
+    current_tile_size = TILE_SIZE
+    current_move_speed_multiplier = 1.0
+    state.tiles_generated += 1
+
+    if state.picked_power_up:
+        current_tile_size = 80
+
+    if state.purple_tile_active:
+        current_tile_size = int(TILE_SIZE * 1.25)
+        current_move_speed_multiplier = 0.20
+
+    state.tile_timers.run_due(state.tiles_generated)
+
+    kind, mode, mode_left, dx, absolute_x, move_dir, move_range = state.course.take()
+    last_tile = tiles[-1]
+    new_pos_z = last_tile.z - JUMP_DISTANCE
+
+    if kind == BOAT_DOCK:
+        tiles.append(Tile(0, 0, new_pos_z, current_tile_size * 1.5, 'boat_dock', BOAT_DOCK_COLOR))
+        return
+
+    state.current_game_mode = mode
+    state.mode_tiles_remaining = mode_left
+    state.tile_count += 1
+    state.tile_spawn_count += 1
+    state.frenzy_mode = (game_modes[mode]["name"] == "frenzy")
+
+    # Frenzy tiles sit in the middle of the river, the rest zig-zag off the last tile
+    new_pos_x = dx if absolute_x else last_tile.x_at(state.time) + dx
+    new_pos_x = max(-RIVER_WIDTH + current_tile_size/2, min(RIVER_WIDTH - current_tile_size/2, new_pos_x))
+
+    tile_type, color = COURSE_TILES[kind]
+    if kind == POWER_UP:
+        state.purple_tile_active = True
+        state.purple_tile_start_time = state.time
+        state.tile_timers.cancel(state.purple_tile_expiry)
+        state.purple_tile_expiry = state.tile_timers.schedule(
+            state.tiles_generated + MAX_PURPLE_AFFECTED_TILES, expire_purple_tile, state)
+
+    new_tile = Tile(new_pos_x, 0, new_pos_z, current_tile_size, tile_type, color)
+
+    # Add type-specific properties
+    if tile_type == 'moving':
+        new_tile.move_dir = move_dir
+        new_tile.move_range = move_range
+        new_tile.move_speed = (10 + (state.score * 0.75)) * current_move_speed_multiplier
+        new_tile.move_start = state.time
+        new_tile.move_low = -RIVER_WIDTH + current_tile_size/2
+        new_tile.move_high = RIVER_WIDTH - current_tile_size/2
+
+    tiles.append(new_tile)
+
+def expire_picked_power_up(state):
+    state.picked_power_up = False
+    state.picked_power_up_expiry = None
+    announce(state, "Power-up expired after 5 tiles!")
+
+def expire_purple_tile(state):
+    state.purple_tile_active = False
+    state.purple_tile_expiry = None
+    announce(state, "Purple tile effect expired after 5 tiles!")
+
+def tiles_left(state, expiry):
+    """How many more generated tiles an effect lasts, counting the one it expires on."""
+    return expiry.due - state.tiles_generated if expiry is not None else 0
+
+def arm_trap(state, tile):
+    """Lights the fuse on a trap tile the player has landed on."""
+    if not tile.is_active:
+        tile.is_active = True
+        tile.pulse_start_time = state.time
+        state.armed_traps.append(tile)
+    state.timers.cancel(tile.fuse)
+    tile.fuse = state.timers.schedule(tile.pulse_start_time + TRAP_FUSE_TIME, trap_fuse, state, tile)
+
+def trap_fuse(state, tile):
+    """Fires a burnt-down trap if the player is standing on it, ending the step."""
+    tile.fuse = None
+    tiles, player_pos = state.tiles, state.player_pos
+    if tiles.by_seq(tile.seq) is not tile:
+        return False
+    if state.phase == 'AIMING' and tile.contains(player_pos[0], player_pos[2]):
+        if state.score >= 5:
+            state.score = max(0, state.score - 5)
+            return_to_start(state)
+            announce(state, "Trap activated! Lost 5 points and reset position.")
+        else:
+            end_game(state, 'trap')
+            announce(state, f"Trap activated but not enough points! Current score: {state.score}")
+            announce(state, "GAME OVER - No points left!")
+        return True
+    # Still on the tile mid-jump: check again next step. Landing back on it re-arms it.
+    if tiles.current is tile:
+        tile.fuse = state.timers.schedule(state.time, trap_fuse, state, tile)
+    return False
+
+def start_frenzy_countdown(state):
+    state.last_jump_time = state.time
+    state.timers.cancel(state.frenzy_collapse)
+    state.frenzy_collapse = state.timers.schedule(state.time + FRENZY_COLLAPSE_TIME, frenzy_collapse, state)
+
+def frenzy_collapse(state):
+    """Ends frenzy mode when the player waited too long on a yellow tile, ending the step."""
+    state.frenzy_collapse = None
+    if not state.frenzy_mode:
+        state.last_jump_time = None
+        return False
+    if state.phase != 'AIMING':
+        state.frenzy_collapse = state.timers.schedule(state.time, frenzy_collapse, state)
+        return False
+    state.frenzy_mode = False
+    state.last_jump_time = None
+    return True
+
+def finish_drowning(state):
+    if state.phase == 'DROWNING':
+        return_to_start(state)
+        announce(state, "Fell in water! Reset to start position.")
+
+def generate_boat_exit(state):
+    """Generate exit dock for boat mode"""
+    player_pos = state.player_pos
+    state.tiles.clear()
+    state.tiles.append(Tile(player_pos[0], 0, player_pos[2] - 150, TILE_SIZE * 2.0, 'exit_dock', EXIT_DOCK_COLOR))
+
+def generate_new_obstacle(state):
+    obstacles, player_pos, rng = state.obstacles, state.player_pos, state.rng.obstacles
+    last_x, last_z = 0, player_pos[2] - 800
+    if obstacles:
+        last_x, last_z = obstacles[-1].x, obstacles[-1].z
+
+    new_pos_z = last_z - OBSTACLE_VERTICAL_SPACING
+    state.obstacle_spawn_count += 1
+
+    # 40% chance to spawn directly in front of player, 60% chance for normal spawn
+    if rng.random() < 0.4:
+        new_pos_x = player_pos[0] + rng.uniform(-30, 30)
+    else:
+        # Normal spawn logic
+        if state.obstacle_spawn_count % 2 == 0:
+            new_pos_x = last_x
+        else:
+            new_pos_x = last_x + rng.uniform(-120, 120)
+
+    new_pos_x = max(-RIVER_WIDTH + 50, min(RIVER_WIDTH - 50, new_pos_x))
+    obstacles.append(Obstacle(new_pos_x, 0, new_pos_z, rng.uniform(40, 60)))
+
+def generate_boat_coconut(state):
+    """Generate a floating coconut for boat mode"""
+    rng = state.rng.coconuts
+    coconut_x = rng.uniform(-RIVER_WIDTH + 20, RIVER_WIDTH - 20)
+    coconut_z = state.player_pos[2] - rng.uniform(200, 400)
+    coconut_y = rng.uniform(40, 60)
+    state.boat_coconuts.append(BoatCoconut(coconut_x, coconut_y, coconut_z))
+
+def spawn_bullet(state):
+    """Fires a bullet from the player's gun hand along the aiming line."""
+    angle_rad = math.radians(state.player_angle)
+    x, y, z = state.player_pos
+    x += BULLET_HAND_X * math.cos(angle_rad)
+    y += BULLET_HAND_Y
+    z += BULLET_HAND_X * math.sin(angle_rad)
+    state.bullets.spawn(x, y, z, state.player_angle - 90)
+    state.fire_bullet = False
+
+def update_bullet_coconut_collision(state):
+    if not state.bullets:
+        return
+    # Each tree claims the oldest nearby bullet, then the hits are scored together
+    shot_trees = []
+    for tile in state.tiles:
+        if tile.type == 'coconut' and not tile.tree_shot:
+            tree_offset = tile.size * 0.35
+            trunk_x = tile.x + tree_offset
+            trunk_z = tile.z
+            trunk_y_min = tile.y + TILE_HEIGHT/2
+            trunk_y_max = trunk_y_min + 20
+            hit = state.bullets.first_in_column(trunk_x, trunk_z, 20, trunk_y_min, trunk_y_max + 20)
+            if hit != -1:
+                state.bullets.kill(hit)
+                shot_trees.append(tile)
+    for tile in shot_trees:
+        announce(state, "Coconut tree shot!")
+        tile.tree_shot = True
+        state.score += 5
+
+def update_boat_coconut_collision(state):
+    """Check collision between bullets and boat coconuts"""
+    if not state.bullets:
+        return
+    shot_coconuts = []
+    for coconut in state.boat_coconuts:
+        if not coconut.collected:
+            hit = state.bullets.first_in_sphere(coconut.x, coconut.y, coconut.z, coconut.radius)
+            if hit != -1:
+                state.bullets.kill(hit)
+                shot_coconuts.append(coconut)
+    for coconut in shot_coconuts:
+        announce(state, "Boat coconut shot! +5 points")
+        coconut.collected = True
+        state.score += 5
+        state.boat_coconuts_collected += 1
+
+def restart(state):
+    """Handles the restart key: free after game over, otherwise costs 10 points."""
+    if state.phase == 'GAME_OVER':
+        announce(state, "Restarting game from beginning!")
+        reset_game(state)
+    elif state.score >= 10:
+        reset_score = max(0, state.score - 10)
+        announce(state, "Game reset! Lost 10 points.")
+        reset_game(state)
+        state.score = reset_score
+    else:
+        end_game(state, 'restart')
+        announce(state, f"Cannot restart! Need at least 10 points. Current score: {state.score}")
+        announce(state, "GAME OVER - No points left to restart!")
+
+def click(state):
+    """Handles a left click: fire in shooting mode, otherwise jump to the next tile along the arrow."""
+    player_pos = state.player_pos
+    if state.phase == 'AIMING' and not state.autoplay_active:
+        if state.shooting_mode:
+            state.fire_bullet = True
+            return
+        # Normal jump
+        target_tile = state.tiles.next_target
+        if target_tile is not None:
+            state.phase = 'JUMPING'
+            state.jump_start_pos = list(player_pos)
+            dx_target = target_tile.x_at(state.time) - player_pos[0]
+            dz_target = target_tile.z - player_pos[2]
+            actual_dist_to_tile = math.sqrt(dx_target**2 + dz_target**2)
+            angle_rad = math.radians(state.arrow_angle)
+            state.jump_end_pos = [
+                player_pos[0] - actual_dist_to_tile*math.sin(angle_rad),
+                player_pos[1],
+                player_pos[2] - actual_dist_to_tile*math.cos(angle_rad)
+            ]
+            state.player_angle = state.arrow_angle
+            state.jump_start_time = state.time
+
+    elif state.phase == 'BOAT_MODE' and state.shooting_mode:
+        state.fire_bullet = True
+
+def apply_inputs(state, inputs):
+    # Toggle autoplay
+    if inputs.toggle_autoplay:
+        state.autoplay_active = not state.autoplay_active
+        if state.autoplay_active:
+            state.shooting_mode = False
+
+    # Toggle shooting mode
+    if inputs.toggle_shooting and state.phase == 'AIMING':
+        state.shooting_mode = not state.shooting_mode
+
+    # Aiming controls
+    if not state.autoplay_active:
+        state.arrow_angle += inputs.aim
+        if state.phase == 'AIMING':
+            state.player_angle = state.arrow_angle
+
+    # Boat movement
+    if state.phase == 'BOAT_MODE' and not state.autoplay_active and inputs.strafe:
+        state.player_pos[0] += inputs.strafe * BOAT_STRAFE_SPEED * FIXED_DT
+        state.player_pos[0] = max(-RIVER_WIDTH + 25, min(RIVER_WIDTH - 25, state.player_pos[0]))
+
+    if inputs.restart:
+        restart(state)
+
+    if inputs.click:
+        click(state)
+
+def update_game_state(state, dt):
+    tiles, player_pos = state.tiles, state.player_pos
+
+    # Power-up effect: change jump duration
+    jump_duration = POWER_UP_JUMP_DURATION if state.picked_power_up else PLAYER_JUMP_DURATION
+
+    # Update bullets
+    state.bullets.update(dt)
+    update_bullet_coconut_collision(state)
+    update_boat_coconut_collision(state)
+
+    # Autoplay logic
+    if state.autoplay_active and state.phase == 'AIMING':
+        target_tile = tiles.next_target
+        if target_tile is not None:
+            target_x = target_tile.x_at(state.time)
+            dx, dz = target_x - player_pos[0], target_tile.z - player_pos[2]
+            target_angle_rad = math.atan2(-dx, -dz)
+            target_angle_deg = math.degrees(target_angle_rad)
+            angle_diff = (target_angle_deg - state.arrow_angle + 180) % 360 - 180
+            state.arrow_angle += angle_diff * 0.15
+            state.player_angle = state.arrow_angle
+            if abs(angle_diff) < 1.0:
+                state.phase = 'JUMPING'
+                state.jump_start_pos = list(player_pos)
+                state.jump_end_pos = [target_x, player_pos[1], target_tile.z]
+                state.jump_start_time = state.time
+
+    # Trap fuses, frenzy collapse and drowning
+    if state.timers.run_due(state.time):
+        return
+
+    # Pulse the armed traps that are still on the track
+    if state.armed_traps:
+        first_seq = tiles.first_seq
+        state.armed_traps[:] = [tile for tile in state.armed_traps if tile.seq >= first_seq]
+        if state.phase != 'BOAT_MODE':
+            for tile in state.armed_traps:
+                elapsed = state.time - tile.pulse_start_time
+                pulse = 0.5 * (0.5 + 0.5 * math.sin(elapsed * TRAP_PULSE_SPEED))
+                tile.color = (1.0, pulse, pulse)
+
+    # Jumping animation
+    if state.phase == 'JUMPING':
+        progress = min((state.time - state.jump_start_time) / jump_duration, 1.0)
+        jump_start_pos, jump_end_pos = state.jump_start_pos, state.jump_end_pos
+        player_pos[0] = (1-progress) * jump_start_pos[0] + progress * jump_end_pos[0]
+        player_pos[2] = (1-progress) * jump_start_pos[2] + progress * jump_end_pos[2]
+        player_pos[1] = jump_start_pos[1] + (4 * (progress - progress**2)) * PLAYER_JUMP_HEIGHT
+        state.jump_anim_arm_angle = 90 * math.sin(progress * math.pi)
+        state.jump_anim_leg_angle = -45 * math.sin(progress * math.pi)
+        if progress >= 1.0:
+            state.phase = 'LANDED'
+            state.jump_anim_arm_angle, state.jump_anim_leg_angle = 0.0, 0.0
+
+    # Landing logic
+    elif state.phase == 'LANDED':
+        landed_safely = False
+        # A long sideways jump can carry past the next tile, so every tracked tile is tested
+        for tile in tiles:
+            if tile.contains(player_pos[0], player_pos[2], state.time):
+                landed_safely = True
+                tile.player_on_tile = True
+                tiles.set_current(tile)
+                # A moving tile stops where it is when the player lands on it
+                tile.x = tile.x_at(state.time)
+                player_pos[0], player_pos[2], player_pos[1] = tile.x, tile.z, TILE_HEIGHT/2
+
+                if tile.type == 'boat_dock':
+                    state.phase = 'BOAT_MODE'
+                    player_pos[1] = 0.0
+                    tiles.clear()
+                    state.boat_coconuts_spawned = 0
+                    state.boat_coconuts_collected = 0
+                    return
+                elif tile.type == 'exit_dock':
+                    state.phase = 'AIMING'
+                    state.score = 35
+                    generate_new_tile(state)
+                    generate_new_tile(state)
+                    generate_new_tile(state)
+                    return
+                elif tile.type == 'moving':
+                    tile.type = 'safe'
+                    tile.color = SAFE_COLOR
+                elif tile.type == 'trap':
+                    arm_trap(state, tile)
+                elif tile.type == 'power_up':
+                    state.picked_power_up = True
+                    state.tile_timers.cancel(state.picked_power_up_expiry)
+                    state.picked_power_up_expiry = state.tile_timers.schedule(
+                        state.tiles_generated + MAX_PICKED_POWER_UP_TILES, expire_picked_power_up, state)
+                    announce(state, "Power-up collected! Jump duration: 0.09, Tile size: 80")
+
+                # Award points and generate new tile (always generate regardless of tile state)
+                if not tile.is_active:
+                    if tile.type == 'coconut' and tile.tree_shot:
+                        state.score += 1
+
+                    if state.frenzy_mode:
+                        if tile.color == FRENZY_COLOR:
+                            start_frenzy_countdown(state)
+                        state.score += 5
+                        state.arrow_angle = 0
+                        state.player_angle = 0
+                    else:
+                        state.score += 1
+
+                # Always generate new tile when landing, regardless of tile state
+                generate_new_tile(state)
+
+                state.phase = 'AIMING'
+                break
+            else:
+                tile.player_on_tile = False
+
+        if not landed_safely:
+            penalty_points = 2 if abs(player_pos[0]) < RIVER_WIDTH else 5
+
+            if state.score >= penalty_points:
+                state.phase = 'DROWNING'
+                state.drown_start_time = state.time
+                state.timers.schedule(state.time + DROWN_DURATION, finish_drowning, state)
+                state.score = max(0, state.score - penalty_points)
+                if abs(player_pos[0]) < RIVER_WIDTH:
+                    announce(state, "Fell in water! Lost 2 points.")
+                else:
+                    announce(state, "Fell outside bounds! Lost 5 points.")
+            else:
+                end_game(state, 'water' if abs(player_pos[0]) < RIVER_WIDTH else 'out_of_bounds')
+                announce(state, f"Not enough points for penalty! Current score: {state.score}, needed: {penalty_points}")
+                announce(state, "GAME OVER - No points left!")
+
+    # Sink until the drowning timer puts the player back on the start tile
+    elif state.phase == 'DROWNING':
+        player_pos[1] -= 20 * dt
+
+    # Boat mode logic
+    if state.phase == 'BOAT_MODE':
+        update_boat_mode(state, dt)
+
+def update_boat_mode(state, dt):
+    tiles, obstacles, player_pos = state.tiles, state.obstacles, state.player_pos
+    player_pos[2] -= BOAT_FORWARD_SPEED * dt
+    state.player_angle = 0
+    if (state.boat_coconuts_spawned < MAX_BOAT_COCONUTS and state.boat_obstacles_passed % 2 == 0
+            and state.boat_obstacles_passed > 0):
+        expected_coconuts = state.boat_obstacles_passed // 2
+        if state.boat_coconuts_spawned < expected_coconuts:
+            generate_boat_coconut(state)
+            state.boat_coconuts_spawned += 1
+            announce(state, f"Coconut spawned! Total spawned: {state.boat_coconuts_spawned} at obstacle milestone: {state.boat_obstacles_passed}")
+
+    if state.autoplay_active:
+        closest_obstacle = None
+        min_distance = float('inf')
+
+        for obs in obstacles:
+            if obs.z < player_pos[2] and obs.z > player_pos[2] - 200:
+                distance = abs(player_pos[2] - obs.z)
+                if distance < min_distance:
+                    min_distance = distance
+                    closest_obstacle = obs
+
+        if closest_obstacle:
+            obs_x = closest_obstacle.x
+            obs_size = closest_obstacle.size
+
+            # If obstacle is too close to our path, move away
+            if abs(player_pos[0] - obs_x) < obs_size/2 + 40:
+                if player_pos[0] < obs_x:
+                    player_pos[0] -= BOAT_STRAFE_SPEED * dt
+                else:
+                    player_pos[0] += BOAT_STRAFE_SPEED * dt
+                player_pos[0] = max(-RIVER_WIDTH + 25, min(RIVER_WIDTH - 25, player_pos[0]))
+
+    # Generate obstacles
+    if not obstacles or obstacles[-1].z > player_pos[2] - OBSTACLE_VERTICAL_SPACING:
+        generate_new_obstacle(state)
+
+    # Check obstacle collisions and scoring
+    for obs in obstacles:
+        if (abs(player_pos[0] - obs.x) < 25 + obs.size/2 and
+            abs(player_pos[2] - obs.z) < 50 + obs.size/2):
+            if state.score >= 3:
+                state.score = max(0, state.score - 3)
+                player_pos[0] = 0.0
+                announce(state, "Boat hit obstacle! Lost 3 points and reset position.")
+            else:
+                end_game(state, 'boat_collision')
+                announce(state, f"Boat collision but not enough points! Current score: {state.score}")
+                announce(state, "GAME OVER - No points left!")
+            return
+        # Mark obstacle as passed when player moves past it (player Z < obstacle Z)
+        if not obs.passed and player_pos[2] < obs.z:
+            obs.passed = True
+            state.boat_obstacles_passed += 1
+            announce(state, f"Obstacle passed! Total: {state.boat_obstacles_passed}")
+
+    # Check coconut collisions and scoring
+    for coconut in state.boat_coconuts[:]:
+        if not coconut.collected:
+            if (abs(player_pos[0] - coconut.x) < 25 + coconut.radius and
+                abs(player_pos[2] - coconut.z) < 50 + coconut.radius):
+                announce(state, "Boat collided with coconut! +5 points")
+                coconut.collected = True
+                state.score += 5
+                state.boat_coconuts_collected += 1
+                state.boat_coconuts.remove(coconut)
+
+    # Check if boat mode is complete (dynamic completion)
+    # Complete boat mode after passing a random number of obstacles
+    if state.boat_obstacles_passed >= state.rng.boat_exit.randint(15, 25) and not state.boat_exit_generated:
+        generate_boat_exit(state)
+        state.boat_exit_generated = True
+        announce(state, "Boat exit dock generated! Navigate to the green dock ahead.")
+
+    # Check collision with exit dock
+    if state.boat_exit_generated and tiles:
+        exit_dock = tiles[0]
+        if exit_dock.contains(player_pos[0], player_pos[2]):
+            state.phase = 'AIMING'
+            player_pos[0] = exit_dock.x
+            player_pos[1] = TILE_HEIGHT / 2
+            player_pos[2] = exit_dock.z
+            state.boat_exit_generated = False
+            state.boat_obstacles_passed = 0
+            state.boat_segments_completed += 1
+            state.boat_coconuts_spawned = 0
+            state.boat_coconuts_collected = 0
+            state.boat_coconuts.clear()
+            obstacles.clear()
+            tiles.set_current(exit_dock)
+            generate_new_tile(state)
+            generate_new_tile(state)
+            generate_new_tile(state)
+            announce(state, "Boat mode completed! Continuing endless adventure...")
+            return
+
+    # Clean up old obstacles and coconuts
+    obstacles[:] = [obs for obs in obstacles if obs.z < player_pos[2] + 200]
+    state.boat_coconuts[:] = [coco for coco in state.boat_coconuts if coco.z < player_pos[2] + 200]
+
+def step(state, dt, inputs=None):
+    """Advances the game by dt seconds after applying the player's inputs."""
+    if inputs is not None:
+        apply_inputs(state, inputs)
+    # Plan ahead on frames where no tile is placed
+    if state.phase != 'LANDED':
+        state.course.prefetch()
+    state.time += dt
+    if state.phase != 'GAME_OVER':
+        update_game_state(state, dt)
+
+    # Bullets leave the gun once the aiming line is up
+    if state.fire_bullet and state.shooting_mode and state.phase == 'AIMING':
+        spawn_bullet(state)
+
+def run_for(state, seconds, dt=FIXED_DT, frame=None):
+    """Steps the game without inputs for the given simulated time, as fast as the CPU allows.
+
+    `frame` is how much virtual time passes per loop tick; any frame size
+    runs the same steps.
+    """
+    run_virtual(lambda dt: step(state, dt), dt, int(round(seconds / dt)), frame)
+
+def new_game(verbose=True, seed=None):
+    state = GameState(verbose=verbose, seed=seed)
+    reset_game(state)
+    return state
@@ -0,0 +1,291 @@
+import math
+import os
+import struct
+from array import array
+from operator import attrgetter
+import numpy as np
+import simulation as sim
+from bullets import BulletPool
+from course import ROW_DTYPE
+from entities import Tile, Obstacle, BoatCoconut, TILE_TYPES
+from rng import RandomStream, RandomStreams, STREAM_NAMES
+from timers import TimerQueue
+from track import TileTrack
+
+MAGIC = b'IJSN'
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct('<4sH')
+
+# Plain GameState fields, saved together in one struct
+SCALARS = (
+    ('seed', 'Q'), ('time', 'd'), ('score', 'q'), ('verbose', '?'),
+    ('player_angle', 'd'), ('arrow_angle', 'd'),
+    ('autoplay_active', '?'), ('shooting_mode', '?'), ('fire_bullet', '?'),
+    ('jump_start_time', 'd'), ('jump_anim_arm_angle', 'd'), ('jump_anim_leg_angle', 'd'), ('drown_start_time', 'd'),
+    ('tiles_generated', 'q'), ('obstacle_spawn_count', 'q'), ('tile_spawn_count', 'q'), ('tile_count', 'q'),
+    ('current_game_mode', 'q'), ('mode_tiles_remaining', 'q'), ('frenzy_mode', '?'),
+    ('picked_power_up', '?'), ('purple_tile_active', '?'), ('purple_tile_start_time', 'd'),
+    ('boat_obstacles_passed', 'q'), ('boat_exit_generated', '?'), ('boat_coconuts_spawned', 'q'),
+    ('boat_coconuts_collected', 'q'), ('boat_segments_completed', 'q'),
+)
+SCALAR_NAMES = tuple(name for name, _ in SCALARS)
+SCALAR = struct.Struct('<' + ''.join(code for _, code in SCALARS))
+get_scalars = attrgetter(*SCALAR_NAMES)
+# Phase, cause of death, start tile, player position, jump ends and last frenzy jump; None is -1 or NaN
+EXTRAS = struct.Struct('<bbq3d3d3dd')
+
+COUNT = struct.Struct('<I')
+TIMER = struct.Struct('<dBq')
+TRACK = struct.Struct('<Hqq')
+TILE = struct.Struct('<4dB3dd?qb6d??')
+OBSTACLE = struct.Struct('<4d?')
+STREAM = struct.Struct('<16s16sBIHH')
+PLANNER = struct.Struct('<qqqbdII')
+
+# Every function the simulation schedules, and the state field that holds its timer
+CALLBACKS = (sim.trap_fuse, sim.frenzy_collapse, sim.finish_drowning, sim.expire_picked_power_up, sim.expire_purple_tile)
+TIMER_FIELDS = {sim.frenzy_collapse: 'frenzy_collapse', sim.expire_picked_power_up: 'picked_power_up_expiry',
+                sim.expire_purple_tile: 'purple_tile_expiry'}
+CALLBACK_INDEX = {callback: index for index, callback in enumerate(CALLBACKS)}
+
+NAN = float('nan')
+
+
+def _point(values):
+    return (NAN, NAN, NAN) if values is None else values
+
+
+def _unpoint(x, y, z):
+    return None if math.isnan(x) else [x, y, z]
+
+
+def _save_timers(parts, queue, tiles):
+    # A fuse for a tile that has left the track would do nothing when it fires, so it is not saved
+    pending = [timer for timer in queue.pending()
+               if timer.callback is not sim.trap_fuse or tiles.by_seq(timer.args[1].seq) is timer.args[1]]
+    parts.append(COUNT.pack(len(pending)))
+    for timer in pending:
+        index = CALLBACK_INDEX.get(timer.callback)
+        if index is None:
+            raise ValueError(f"cannot snapshot a timer for {timer.callback!r}")
+        tile = timer.args[1] if len(timer.args) > 1 else None
+        parts.append(TIMER.pack(timer.due, index, -1 if tile is None else tile.seq))
+
+
+def _load_timers(data, offset, state, queue, whole):
+    queue.clear()
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    for due, index, seq in TIMER.iter_unpack(data[offset:offset + count * TIMER.size]):
+        callback = CALLBACKS[index]
+        due = int(due) if whole else due
+        if callback is sim.trap_fuse:
+            # Snapshots written before off-track fuses were dropped may still hold some
+            tile = state.tiles.by_seq(seq)
+            if tile is not None:
+                tile.fuse = queue.schedule(due, callback, state, tile)
+            continue
+        timer = queue.schedule(due, callback, state)
+        if callback in TIMER_FIELDS:
+            setattr(state, TIMER_FIELDS[callback], timer)
+    return offset + count * TIMER.size
+
+
+def save(state):
+    """The whole game state as versioned snapshot bytes."""
+    parts = [HEADER.pack(MAGIC, SNAPSHOT_VERSION), SCALAR.pack(*get_scalars(state))]
+    parts.append(EXTRAS.pack(
+        sim.GAME_STATES.index(state.phase),
+        -1 if state.cause_of_death is None else sim.DEATH_CAUSES.index(state.cause_of_death),
+        -1 if state.start_seq is None else state.start_seq,
+        *state.player_pos, *_point(state.jump_start_pos), *_point(state.jump_end_pos),
+        NAN if state.last_jump_time is None else state.last_jump_time))
+
+    track = state.tiles
+    parts.append(TRACK.pack(track.window, track.next_seq, -1 if track.current_seq is None else track.current_seq))
+    parts.append(COUNT.pack(len(track)))
+    for t in track:
+        parts.append(TILE.pack(t.x, t.y, t.z, t.size, TILE_TYPES.index(t.type), *t.color, t.origin_x,
+                               t.player_on_tile, t.seq, t.move_dir, t.move_range, t.move_speed, t.move_start,
+                               t.move_low, t.move_high, t.pulse_start_time, t.is_active, t.tree_shot))
+    parts.append(COUNT.pack(len(state.armed_traps)))
+    parts.append(array('q', [tile.seq for tile in state.armed_traps]).tobytes())
+
+    # Timers refer to tiles by seq, so they come after the track
+    _save_timers(parts, state.timers, state.tiles)
+    _save_timers(parts, state.tile_timers, state.tiles)
+
+    for items in (state.obstacles, state.boat_coconuts):
+        parts.append(COUNT.pack(len(items)))
+        for item in items:
+            size = item.size if isinstance(item, Obstacle) else item.radius
+            flag = item.passed if isinstance(item, Obstacle) else item.collected
+            parts.append(OBSTACLE.pack(item.x, item.y, item.z, size, flag))
+
+    bullets = state.bullets
+    count = bullets.count
+    parts.append(COUNT.pack(count))
+    for block in (bullets.position, bullets.velocity, bullets.origin, bullets.alive):
+        parts.append(block[:count].tobytes())
+
+    for name in STREAM_NAMES:
+        stream = getattr(state.rng, name)
+        bit_state = stream.generator.bit_generator.state
+        values = stream.block_left()
+        parts.append(STREAM.pack(bit_state['state']['state'].to_bytes(16, 'little'),
+                                 bit_state['state']['inc'].to_bytes(16, 'little'),
+                                 bit_state['has_uint32'], bit_state['uinteger'], stream.block_size, len(values)))
+        parts.append(array('d', values).tobytes())
+
+    course = state.course
+    parts.append(COUNT.pack(course is not None))
+    if course is not None:
+        planner = course.planner
+        parts.append(PLANNER.pack(planner.slots, planner.tile_count, planner.spawn_count, planner.prev_kind,
+                                  planner.last_x, course.chunk_size, course.low_water))
+        parts.append(COUNT.pack(len(planner.run_modes)))
+        parts.append(array('q', planner.run_modes).tobytes())
+        parts.append(array('q', planner.run_lengths).tobytes())
+        rows = course.waiting()
+        parts.append(COUNT.pack(len(rows)))
+        parts.append(rows.tobytes())
+    return b''.join(parts)
+
+
+def restore(data, into=None):
+    """The GameState saved in `data`.
+
+    With `into`, that state is overwritten and its random generators,
+    bullet arrays and course planner are reused. That is much cheaper
+    than building new ones, so lookahead search should restore into a
+    scratch state rather than create a fresh one each time.
+    """
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not an Island Jumper snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {version} is not supported (expected {SNAPSHOT_VERSION})")
+    state = into if into is not None else sim.GameState.__new__(sim.GameState)
+    offset = HEADER.size
+
+    for name, value in zip(SCALAR_NAMES, SCALAR.unpack_from(data, offset)):
+        setattr(state, name, value)
+    offset += SCALAR.size
+    extras = EXTRAS.unpack_from(data, offset)
+    offset += EXTRAS.size
+    state.phase = sim.GAME_STATES[extras[0]]
+    state.cause_of_death = None if extras[1] < 0 else sim.DEATH_CAUSES[extras[1]]
+    state.start_seq = None if extras[2] < 0 else extras[2]
+    state.player_pos = list(extras[3:6])
+    state.jump_start_pos = _unpoint(*extras[6:9])
+    state.jump_end_pos = _unpoint(*extras[9:12])
+    state.last_jump_time = None if math.isnan(extras[12]) else extras[12]
+    state.frenzy_collapse = state.picked_power_up_expiry = state.purple_tile_expiry = None
+
+    window, next_seq, current_seq = TRACK.unpack_from(data, offset)
+    offset += TRACK.size
+    track = state.tiles if into is not None and state.tiles.window == window else TileTrack(window)
+    track.clear()
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    track.next_seq = next_seq - count
+    for (x, y, z, size, kind, r, g, b, origin_x, on_tile, seq, move_dir, move_range, move_speed, move_start,
+         move_low, move_high, pulse_start_time, is_active, tree_shot) in TILE.iter_unpack(
+            data[offset:offset + count * TILE.size]):
+        tile = Tile(x, y, z, size, TILE_TYPES[kind], (r, g, b), origin_x)
+        tile.player_on_tile, tile.move_dir, tile.move_range, tile.move_speed = on_tile, move_dir, move_range, move_speed
+        tile.move_start, tile.move_low, tile.move_high = move_start, move_low, move_high
+        tile.pulse_start_time, tile.is_active, tile.tree_shot = pulse_start_time, is_active, tree_shot
+        track.append(tile)
+    offset += count * TILE.size
+    track.current_seq = None if current_seq < 0 else current_seq
+    state.tiles = track
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    seqs = array('q', data[offset:offset + 8 * count])
+    offset += 8 * count
+    state.armed_traps = [tile for tile in map(track.by_seq, seqs) if tile is not None]
+
+    if into is None:
+        state.timers, state.tile_timers = TimerQueue(), TimerQueue()
+    offset = _load_timers(data, offset, state, state.timers, whole=False)
+    offset = _load_timers(data, offset, state, state.tile_timers, whole=True)
+
+    for name, kind in (('obstacles', Obstacle), ('boat_coconuts', BoatCoconut)):
+        (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+        items = []
+        for x, y, z, size, flag in OBSTACLE.iter_unpack(data[offset:offset + count * OBSTACLE.size]):
+            item = kind(x, y, z, size)
+            if kind is Obstacle:
+                item.passed = flag
+            else:
+                item.collected = flag
+            items.append(item)
+        offset += count * OBSTACLE.size
+        setattr(state, name, items)
+
+    if into is None:
+        state.bullets = BulletPool(sim.BULLET_SPEED, sim.BULLET_MAX_DISTANCE)
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    blocks = []
+    for _ in range(3):
+        blocks.append(np.frombuffer(data, np.float64, count * 3, offset).reshape(count, 3))
+        offset += count * 24
+    state.bullets.load(*blocks, np.frombuffer(data, np.bool_, count, offset))
+    offset += count
+
+    if into is None:
+        state.rng = RandomStreams.__new__(RandomStreams)
+        state.rng.seed = state.seed
+    for name in STREAM_NAMES:
+        stream_state, inc, has_uint32, uinteger, block_size, count = STREAM.unpack_from(data, offset)
+        offset += STREAM.size
+        stream = getattr(state.rng, name, None) if into is not None else None
+        if stream is None:
+            stream = RandomStream(np.random.SeedSequence(0), block_size)
+            setattr(state.rng, name, stream)
+        stream.block_size = block_size
+        stream.generator.bit_generator.state = {
+            'bit_generator': 'PCG64',
+            'state': {'state': int.from_bytes(stream_state, 'little'), 'inc': int.from_bytes(inc, 'little')},
+            'has_uint32': has_uint32, 'uinteger': uinteger}
+        stream.set_block(array('d', data[offset:offset + 8 * count]).tolist())
+        offset += 8 * count
+    state.rng.seed = state.seed
+
+    (has_course,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    if not has_course:
+        state.course = None
+        return state
+    slots, tile_count, spawn_count, prev_kind, last_x, chunk_size, low_water = PLANNER.unpack_from(data, offset)
+    offset += PLANNER.size
+    if into is None or state.course is None:
+        state.course = sim.new_course(state)
+    course, planner = state.course, state.course.planner
+    planner.slots, planner.tile_count, planner.spawn_count = slots, tile_count, spawn_count
+    planner.prev_kind, planner.last_x = prev_kind, last_x
+    course.chunk_size, course.low_water = chunk_size, low_water
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    planner.run_modes = array('q', data[offset:offset + 8 * count]).tolist()
+    offset += 8 * count
+    planner.run_lengths = array('q', data[offset:offset + 8 * count]).tolist()
+    offset += 8 * count
+    (count,), offset = COUNT.unpack_from(data, offset), offset + COUNT.size
+    # Planned rows are only ever read, so they can stay in the snapshot buffer
+    course.set_waiting(np.frombuffer(data, ROW_DTYPE, count, offset))
+    return state
+
+
+def clone(state):
+    """An independent copy of the game, via a snapshot."""
+    return restore(save(state))
+
+
+def save_file(state, path):
+    """Writes a snapshot so that a crash mid-write leaves the previous file intact."""
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(save(state))
+    os.replace(temporary, path)
+
+
+def load_file(path, into=None):
+    with open(path, 'rb') as file:
+        return restore(file.read(), into)
@@ -0,0 +1,31 @@
+import math
+import numpy as np
+
+
+class ZBuckets:
+    """Broad-phase index of points bucketed along the river's Z axis.
+
+    build() assigns every point to a cell of `cell_size` units and sorts the
+    point indices by cell. candidates() then finds every point in the cells
+    overlapping a Z range with two binary searches, so a target only tests
+    the handful of points that are actually near it.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.order = np.zeros(0, dtype=np.intp)
+        self.sorted_cells = np.zeros(0, dtype=np.int64)
+
+    def build(self, z_values):
+        cells = np.floor(np.asarray(z_values) / self.cell_size).astype(np.int64)
+        self.order = np.argsort(cells, kind='stable')
+        self.sorted_cells = cells[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def candidates(self, z_min, z_max):
+        """Indices of the points whose cell overlaps [z_min, z_max]."""
+        lo = np.searchsorted(self.sorted_cells, math.floor(z_min / self.cell_size), 'left')
+        hi = np.searchsorted(self.sorted_cells, math.floor(z_max / self.cell_size), 'right')
+        return self.order[lo:hi]
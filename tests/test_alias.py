@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import simulation as sim
+from course import KINDS, alias_table, sample_alias
+
+WEIGHTS = [
+    [1.0],
+    [1.0, 1.0],
+    [0.0, 3.0, 1.0],
+    [5.0, 0.0, 0.0, 1.0, 2.0, 0.0, 0.5],
+    [0.01, 10.0, 0.2, 7.0],
+]
+
+
+def implied(prob, alias):
+    """The probability of each column that the table encodes."""
+    n = len(prob)
+    result = np.array(prob, dtype=float)
+    np.add.at(result, alias, 1.0 - np.asarray(prob))
+    return result / n
+
+
+@pytest.mark.parametrize('weights', WEIGHTS)
+def test_table_encodes_the_weights(weights):
+    prob, alias = alias_table(weights)
+    expected = np.array(weights) / sum(weights)
+    assert implied(prob, alias) == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize('weights', WEIGHTS)
+def test_sampled_frequencies_follow_the_weights(weights):
+    prob, alias = alias_table(weights)
+    draws = 200000
+    counts = np.bincount(sample_alias(prob, alias, np.random.default_rng(7).random(draws)), minlength=len(weights))
+    expected = np.array(weights) / sum(weights)
+    # Five standard deviations of a binomial count
+    tolerance = 5 * np.sqrt(expected * (1 - expected) / draws) + 1e-12
+    assert np.all(np.abs(counts / draws - expected) <= tolerance)
+    assert np.all(counts[expected == 0] == 0)
+
+
+def test_single_entry_table_always_picks_it():
+    prob, alias = alias_table([2.5])
+    rolls = np.array([0.0, 0.3, 0.999999999])
+    assert sample_alias(prob, alias, rolls).tolist() == [0, 0, 0]
+
+
+def test_stacked_tables_use_each_rolls_row():
+    table = sim.COURSE_TABLE
+    rows = np.repeat(np.arange(len(table.mode_names)), 20000)
+    kinds = sample_alias(table.tile_prob, table.tile_alias, np.random.default_rng(3).random(len(rows)), rows)
+    for row in range(len(table.mode_names)):
+        expected = np.zeros(len(KINDS))
+        for name, weight in sim.game_modes[row]['tiles'].items():
+            expected[KINDS.index(name)] = weight
+        expected /= expected.sum()
+        counts = np.bincount(kinds[rows == row], minlength=len(expected)) / 20000
+        assert np.all(np.abs(counts - expected) <= 5 * np.sqrt(expected * (1 - expected) / 20000) + 1e-12)
+        assert np.all(counts[expected == 0] == 0)
+
+
+@pytest.mark.parametrize('weights', [[], [0.0, 0.0], [1.0, -1.0]])
+def test_bad_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        alias_table(weights)
@@ -0,0 +1,9 @@
+from batch import run_batch
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = run_batch(6, seconds=30.0, workers=1, chunk_size=2)
+    pooled = run_batch(6, seconds=30.0, workers=2, chunk_size=2)
+    assert [result['seed'] for result in serial] == list(range(6))
+    assert pooled == serial
+    assert run_batch(6, seconds=30.0, workers=1, chunk_size=4) == serial
@@ -0,0 +1,52 @@
+import numpy as np
+
+from bullets import BulletPool
+
+
+def test_pool_grows_and_keeps_every_bullet():
+    pool = BulletPool(speed=60.0, max_distance=1000.0, capacity=2)
+    for i in range(9):
+        pool.spawn(float(i), 5.0, 0.0, 0.0)
+    assert pool.count == 9 and len(pool) == 9
+    assert len(pool.alive) >= 9
+    assert pool.positions()[:, 0].tolist() == [float(i) for i in range(9)]
+    assert np.allclose(pool.velocity[:9], (0.0, 0.0, -60.0))
+
+
+def test_expired_bullets_are_compacted_out_in_fire_order():
+    pool = BulletPool(speed=100.0, max_distance=250.0, capacity=4)
+    pool.spawn(0.0, 0.0, 0.0, 0.0)
+    pool.update(1.0)
+    pool.spawn(1.0, 0.0, 0.0, 0.0)
+    pool.update(1.0)
+    pool.spawn(2.0, 0.0, 0.0, 0.0)
+    pool.spawn(3.0, 0.0, 0.0, 90.0)
+    # The first bullet has now gone 300 units, past max_distance
+    pool.update(1.0)
+    assert pool.count == 3
+    assert pool.positions()[:, 0].tolist() == [1.0, 2.0, 3.0 - 100.0]
+    assert not pool.alive[3:].any()
+
+
+def test_killed_bullets_stop_hitting_and_are_dropped_on_update():
+    pool = BulletPool(speed=10.0, max_distance=1000.0, radius=0.1)
+    for x in (0.0, 1.0, 2.0):
+        pool.spawn(x, 0.0, 0.0, 0.0)
+    pool.kill(1)
+    assert len(pool) == 2
+    assert pool.first_in_sphere(1.0, 0.0, 0.0, 0.1) == -1
+    pool.update(0.0)
+    assert pool.count == 2
+    assert pool.positions()[:, 0].tolist() == [0.0, 2.0]
+
+
+def test_oldest_bullet_wins_a_shared_hit():
+    pool = BulletPool(speed=10.0, max_distance=1000.0, radius=1.0)
+    pool.spawn(0.5, 0.0, -100.0, 0.0)
+    pool.spawn(-0.5, 0.0, -100.0, 0.0)
+    pool.spawn(0.0, 0.0, -100.5, 0.0)
+    assert pool.first_in_sphere(0.0, 0.0, -100.0, 2.0) == 0
+    pool.kill(0)
+    assert pool.first_in_sphere(0.0, 0.0, -100.0, 2.0) == 1
+    assert pool.first_in_column(0.0, -100.0, 5.0, -1.0, 1.0) == 1
+    assert pool.first_in_column(0.0, -100.0, 5.0, 2.0, 10.0) == -1
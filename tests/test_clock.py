@@ -0,0 +1,52 @@
+import pytest
+
+import simulation as sim
+import snapshot
+from clock import FixedStepLoop, VirtualClock, run_virtual
+
+
+def autoplay_game(seed):
+    state = sim.new_game(verbose=False, seed=seed)
+    inputs = sim.Inputs()
+    inputs.toggle_autoplay = True
+    sim.step(state, sim.FIXED_DT, inputs)
+    return state
+
+
+@pytest.mark.parametrize('seed', [1, 3])
+def test_frame_size_does_not_change_the_simulation(seed):
+    results = []
+    for frame in (1 / 30, 1 / 60, 1 / 144):
+        state = autoplay_game(seed)
+        steps = run_virtual(lambda dt: sim.step(state, dt), sim.FIXED_DT, 3600, frame)
+        results.append((steps, state.time, snapshot.save(state)))
+    assert results[0][0] == 3600
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_loop_runs_one_step_per_whole_dt():
+    clock = VirtualClock()
+    calls = []
+    loop = FixedStepLoop(clock, calls.append, 1 / 60)
+    assert loop.tick() == 0
+    for _ in range(144):
+        clock.advance(1 / 144)
+        loop.tick()
+    assert loop.steps == 60
+    assert calls == [1 / 60] * 60
+
+
+def test_stall_is_capped_at_max_steps():
+    clock = VirtualClock()
+    loop = FixedStepLoop(clock, lambda dt: None, 1 / 60, max_steps=8)
+    loop.tick()
+    clock.advance(2.0)
+    assert loop.tick() == 8
+    clock.advance(1 / 60)
+    assert loop.tick() <= 2
+
+
+def test_done_stops_the_run_early():
+    calls = []
+    assert run_virtual(calls.append, 0.5, 100, done=lambda: len(calls) >= 3) == 3
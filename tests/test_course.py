@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import simulation as sim
+from course import (CoursePlanner, BOAT_DOCK, BOAT_DOCK_CHANCE, DOCK_FREE_TILES,
+                    DOCK_ROLL, ANGLE_ROLL, WILD_ROLL, KIND_ROLL, DIR_ROLL, RANGE_ROLL, SAFE, sample_alias)
+from rng import RandomStreams
+
+FIELDS = ('kind', 'mode', 'mode_left', 'dx', 'absolute_x', 'move_dir', 'move_range', 'x', 'z')
+
+
+def make_planner(seed):
+    return CoursePlanner(RandomStreams(seed), sim.COURSE_TABLE, sim.TILE_SIZE, sim.JUMP_DISTANCE, sim.RIVER_WIDTH)
+
+
+def plan(seed, chunk_size, slots):
+    planner = make_planner(seed)
+    chunks = [planner.next_chunk(chunk_size) for _ in range(-(-slots // chunk_size))]
+    return {name: np.concatenate([getattr(chunk, name) for chunk in chunks])[:slots] for name in FIELDS}
+
+
+def reference(seed, slots):
+    """The course placed one slot at a time, over the same draws as the planner."""
+    table = sim.COURSE_TABLE
+    planner = make_planner(seed)
+    streams = RandomStreams(seed)
+    draws = streams.course.generator.random((slots, 6))
+    mode_draws = iter(streams.modes.generator.random((slots, 2)))
+    angles = np.radians(-40 + 80 * draws[:, ANGLE_ROLL])
+    swing = -sim.JUMP_DISTANCE * np.sin(angles)
+
+    rows = {name: [] for name in FIELDS}
+    prev, tiles, mode, left, x = SAFE, 0, 0, table.first_duration, 0.0
+    for slot, roll in enumerate(draws):
+        dock = tiles >= DOCK_FREE_TILES and roll[DOCK_ROLL] < BOAT_DOCK_CHANCE and prev != BOAT_DOCK
+        if dock:
+            kind, slot_mode, mode_left, absolute, dx = BOAT_DOCK, -1, 0, True, 0.0
+        else:
+            if left == 0:
+                mode_roll, length_roll = next(mode_draws)
+                mode = int(table.pick_modes(np.array([mode_roll]))[0])
+                left = int(table.duration_low[mode] + int(length_roll * table.duration_span[mode]))
+            left -= 1
+            tiles += 1
+            base = sample_alias(table.tile_prob[mode], table.tile_alias[mode], np.array([roll[KIND_ROLL]]))[0]
+            if roll[WILD_ROLL] < table.wild_chance and table.wild_allowed[prev]:
+                kind = table.wild_kind
+            else:
+                kind = int(table.replace[prev, base])
+            slot_mode, mode_left = mode, left
+            absolute = bool(table.centered[mode])
+            dx = 0.0 if absolute or tiles % 2 == 0 else swing[slot]
+        if absolute:
+            x = dx
+        else:
+            x = min(max(x + dx, -planner.x_limit), planner.x_limit)
+        prev = kind
+        rows['kind'].append(kind)
+        rows['mode'].append(slot_mode)
+        rows['mode_left'].append(mode_left)
+        rows['dx'].append(dx)
+        rows['absolute_x'].append(absolute)
+        rows['move_dir'].append(-1 if roll[DIR_ROLL] < 0.5 else 1)
+        rows['move_range'].append(40 + 40 * roll[RANGE_ROLL])
+        rows['x'].append(x)
+        rows['z'].append(-sim.JUMP_DISTANCE * (slot + 1))
+    return {name: np.array(values) for name, values in rows.items()}
+
+
+@pytest.mark.parametrize('chunk_size', [37, 100, 500, 1024])
+def test_planner_matches_slot_by_slot_reference(chunk_size):
+    expected = reference(5, 3000)
+    planned = plan(5, chunk_size, 3000)
+    for name in FIELDS:
+        assert np.array_equal(planned[name], expected[name]), name
+    assert (expected['kind'] == BOAT_DOCK).any()
@@ -0,0 +1,54 @@
+import pytest
+
+from entities import Tile, MOVING_COLOR, SAFE_COLOR
+
+
+def moving_tile(origin_x=10.0, move_dir=1, speed=40.0, start=2.0, low=-170.0, high=170.0):
+    tile = Tile(origin_x, 0, -150.0, 60.0, 'moving', MOVING_COLOR)
+    tile.move_dir, tile.move_speed, tile.move_start = move_dir, speed, start
+    tile.move_low, tile.move_high = low, high
+    return tile
+
+
+def bounced_x(tile, time):
+    """Walks the tile from origin_x, turning exactly at each wall it reaches."""
+    x, direction = tile.origin_x, tile.move_dir
+    left = time - tile.move_start
+    if left < 0:
+        # Running time backwards is running forwards the other way
+        direction, left = -direction, -left
+    while left > 0:
+        wall = tile.move_high if direction > 0 else tile.move_low
+        reach = abs(wall - x) / tile.move_speed
+        if reach > left:
+            return x + direction * tile.move_speed * left
+        x, left, direction = wall, left - reach, -direction
+    return x
+
+
+@pytest.mark.parametrize('move_dir', [1, -1])
+@pytest.mark.parametrize('time', [2.0, 2.5, 6.0, 7.25, 10.0, 14.5, 19.0, 61.3, 0.0, -1.5, -6.0, -40.7])
+def test_x_at_matches_bouncing_reference(move_dir, time):
+    tile = moving_tile(move_dir=move_dir)
+    assert tile.x_at(time) == pytest.approx(bounced_x(tile, time), abs=1e-9)
+
+
+def test_x_at_hits_the_walls_exactly():
+    tile = moving_tile()
+    # 160 units to the high wall at 40 units/s, then 340 across to the low wall
+    assert tile.x_at(2.0 + 4.0) == 170.0
+    assert tile.x_at(2.0 + 4.0 + 8.5) == -170.0
+    assert tile.x_at(2.0 + 4.0 + 17.0) == 170.0
+    assert tile.x_at(2.0 - 4.5) == -170.0
+
+
+def test_x_at_stays_between_the_walls():
+    tile = moving_tile(origin_x=-35.0, speed=73.0)
+    for step in range(-2000, 2000):
+        assert -170.0 <= tile.x_at(step * 0.037) <= 170.0
+
+
+def test_still_tiles_ignore_time():
+    tile = Tile(42.0, 0, 0.0, 60.0, 'safe', SAFE_COLOR)
+    assert tile.x_at(123.4) == 42.0
+    assert tile.contains(50.0, 10.0, 99.0)
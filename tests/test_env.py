@@ -0,0 +1,80 @@
+import numpy as np
+
+import simulation as sim
+from env import DISCRETE_ACTIONS, IslandJumperEnv, VectorEnv, observation_size
+
+
+def test_observation_shape():
+    env = IslandJumperEnv()
+    observation, info = env.reset(seed=3)
+    assert observation.shape == (observation_size(),)
+    assert observation.dtype == np.float32
+    assert np.isfinite(observation).all()
+    assert info['seed'] == 3
+
+    wide = IslandJumperEnv(tiles=6, obstacles=1, coconuts=0)
+    assert wide.reset(seed=3)[0].shape == (observation_size(6, 1, 0),)
+
+    envs = VectorEnv(3, seed=0, frame_skip=2)
+    observations, _ = envs.reset()
+    assert observations.shape == (3, observation_size())
+    observations, rewards, terminated, truncated, _ = envs.step(np.zeros(3, dtype=np.int64))
+    assert observations.shape == (3, observation_size())
+    assert rewards.shape == terminated.shape == truncated.shape == (3,)
+
+
+def test_truncated_games_reset_with_the_next_seeds():
+    envs = VectorEnv(2, seed=10, max_steps=3)
+    envs.reset()
+    assert [env.state.seed for env in envs.envs] == [10, 11]
+    for _ in range(2):
+        _, _, _, truncated, info = envs.step(np.zeros(2, dtype=np.int64))
+        assert not truncated.any()
+        assert (info['final_score'] == -1).all() and not info['final_observation']
+    scores = [env.state.score for env in envs.envs]
+    _, _, terminated, truncated, info = envs.step(np.zeros(2, dtype=np.int64))
+    assert truncated.all() and not terminated.any()
+    assert info['final_score'].tolist() == scores
+    assert sorted(info['final_observation']) == [0, 1]
+    assert info['final_observation'][0].shape == (observation_size(),)
+    assert [env.state.seed for env in envs.envs] == [12, 13]
+    assert [env.steps for env in envs.envs] == [0, 0]
+
+
+def test_terminated_game_reports_its_final_score_and_observation():
+    envs = VectorEnv(2, seed=0)
+    envs.reset()
+    ended = envs.envs[1].state
+    ended.score = 17
+    sim.end_game(ended, 'water')
+    final = envs.envs[1].observe()
+    _, rewards, terminated, truncated, info = envs.step(np.zeros(2, dtype=np.int64))
+    assert terminated.tolist() == [False, True] and not truncated.any()
+    assert rewards[1] == 0.0
+    assert info['final_score'].tolist() == [-1, 17]
+    assert np.array_equal(info['final_observation'][1], final)
+    assert envs.envs[1].state.seed == 2
+    assert info['score'][1] == 0
+
+
+def test_frame_skip_repeats_only_aim_and_strafe(monkeypatch):
+    seen = []
+    step = sim.step
+
+    def recording_step(state, dt, inputs=None):
+        seen.append(None if inputs is None else (inputs.aim, inputs.strafe, inputs.click, inputs.toggle_shooting))
+        step(state, dt, inputs)
+
+    monkeypatch.setattr(sim, 'step', recording_step)
+    env = IslandJumperEnv(frame_skip=4)
+    env.reset(seed=1)
+    env.step(np.array([7.5, -0.5, 1.0, 1.0]))
+    assert seen == [(7.5, -0.5, True, True)] + [(7.5, -0.5, False, False)] * 3
+
+    seen.clear()
+    env.step(DISCRETE_ACTIONS.index('click'))
+    assert seen == [(0.0, 0.0, True, False)] + [(0.0, 0.0, False, False)] * 3
+
+    seen.clear()
+    env.step(DISCRETE_ACTIONS.index('aim_left'))
+    assert seen == [(sim.AIM_STEP, 0.0, False, False)] * 4
@@ -0,0 +1,14 @@
+import simulation as sim
+
+
+def test_landing_two_tiles_ahead_counts():
+    state = sim.new_game(verbose=False, seed=7)
+    current = state.tiles.current_seq
+    target = state.tiles.by_seq(current + 2)
+    score = state.score
+    state.player_pos[0], state.player_pos[2] = target.x_at(state.time), target.z
+    state.phase = 'LANDED'
+    sim.step(state, sim.FIXED_DT, None)
+    assert state.tiles.current_seq == target.seq
+    assert state.phase != 'DROWNING'
+    assert state.score >= score
@@ -0,0 +1,42 @@
+import random
+
+import simulation as sim
+from recording import Recorder, Recording, Replayer
+
+
+def random_inputs(rng):
+    roll = rng.random()
+    if roll < 0.05:
+        inputs = sim.Inputs()
+        inputs.aim = rng.choice((-2, -1, 1, 2)) * sim.AIM_STEP
+        inputs.strafe = rng.choice((-1, 1))
+        return inputs
+    if roll < 0.07:
+        inputs = sim.Inputs()
+        inputs.click = True
+        return inputs
+    if roll < 0.072:
+        inputs = sim.Inputs()
+        inputs.restart = True
+        return inputs
+    return None
+
+
+def test_replay_reproduces_the_recorded_session(tmp_path):
+    path = tmp_path / "session.ijr"
+    state = sim.new_game(verbose=False, seed=11)
+    rng = random.Random(1)
+    with Recorder(path, state.seed, state.tiles.window) as recorder:
+        for _ in range(6000):
+            inputs = random_inputs(rng)
+            recorder.record(inputs)
+            sim.step(state, sim.FIXED_DT, inputs)
+
+    recording = Recording.load(path)
+    assert recording.frames == 6000
+    replayed = Replayer(recording).run(recording.new_state())
+    assert replayed.time == state.time
+    assert replayed.score == state.score
+    assert replayed.phase == state.phase
+    assert replayed.player_pos == state.player_pos
+    assert replayed.tiles_generated == state.tiles_generated
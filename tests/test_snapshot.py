@@ -0,0 +1,60 @@
+import random
+
+import simulation as sim
+import snapshot
+
+
+def scripted_inputs(step, rng):
+    """Autoplay, with the shooting toggle and aim keys pressed now and then."""
+    if step == 0:
+        inputs = sim.Inputs()
+        inputs.toggle_autoplay = True
+        return inputs
+    roll = rng.random()
+    if roll < 0.01:
+        inputs = sim.Inputs()
+        inputs.toggle_shooting = True
+        return inputs
+    if roll < 0.03:
+        inputs = sim.Inputs()
+        inputs.aim = rng.choice((-1, 1)) * sim.AIM_STEP
+        inputs.strafe = rng.choice((-1, 1))
+        return inputs
+    return None
+
+
+def play(state, first_step, steps, seed=0):
+    rng = random.Random(seed * 100003 + first_step)
+    trail = []
+    for step in range(first_step, first_step + steps):
+        sim.step(state, sim.FIXED_DT, scripted_inputs(step, rng))
+        trail.append((state.phase, state.score, tuple(state.player_pos), state.tiles_generated,
+                      len(state.bullets), tuple((tile.seq, tile.x, tile.type) for tile in state.tiles)))
+    return trail
+
+
+def test_restored_game_plays_on_identically(tmp_path):
+    for seed in (1, 4):
+        state = sim.new_game(verbose=False, seed=seed)
+        play(state, 0, 2500, seed)
+        data = snapshot.save(state)
+        fresh = snapshot.restore(data)
+        into = snapshot.restore(data, into=sim.new_game(verbose=False, seed=99))
+        path = tmp_path / f"game{seed}.ijs"
+        snapshot.save_file(state, path)
+        from_file = snapshot.load_file(path)
+        assert snapshot.save(fresh) == data
+        assert snapshot.save(into) == data
+
+        expected = play(state, 2500, 2500, seed)
+        for copy in (fresh, into, from_file):
+            assert play(copy, 2500, 2500, seed) == expected
+
+
+def test_clone_leaves_the_original_alone():
+    state = sim.new_game(verbose=False, seed=2)
+    play(state, 0, 1200)
+    before = snapshot.save(state)
+    clone = snapshot.clone(state)
+    play(clone, 1200, 1200)
+    assert snapshot.save(state) == before
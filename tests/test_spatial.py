@@ -0,0 +1,48 @@
+import numpy as np
+
+from bullets import BulletPool
+from spatial import ZBuckets
+
+
+def nested_sphere(pool, x, y, z, radius):
+    reach = radius + pool.radius
+    for i in range(pool.count):
+        if pool.alive[i] and np.sum((pool.position[i] - (x, y, z)) ** 2) < reach * reach:
+            return i
+    return -1
+
+
+def nested_column(pool, x, z, radius, y_min, y_max):
+    for i in range(pool.count):
+        px, py, pz = pool.position[i]
+        if pool.alive[i] and (px - x) ** 2 + (pz - z) ** 2 < radius * radius and y_min <= py <= y_max:
+            return i
+    return -1
+
+
+def test_candidates_cover_every_point_in_the_overlapping_cells():
+    buckets = ZBuckets(50.0)
+    z = np.array([-150.0, -100.0, -99.999, -50.0, -0.001, 0.0, 49.999, 50.0, 120.0])
+    buckets.build(z)
+    for z_min, z_max in [(-100.0, -50.0), (-0.5, 0.5), (49.0, 50.0), (-200.0, 200.0), (60.0, 99.0)]:
+        found = set(buckets.candidates(z_min, z_max).tolist())
+        inside = {i for i, value in enumerate(z) if z_min <= value <= z_max}
+        assert inside <= found
+        cells = {int(np.floor(value / 50.0)) for value in (z_min, z_max)}
+        assert all(int(np.floor(z[i] / 50.0)) in range(min(cells), max(cells) + 1) for i in found)
+
+
+def test_hits_on_cell_boundaries_match_the_nested_loop():
+    rng = np.random.default_rng(5)
+    pool = BulletPool(speed=70.0, max_distance=10000.0, radius=1.0, cell_size=50.0)
+    # Bullets sitting on, just before and just after cell edges
+    for edge in range(-10, 11):
+        for nudge in (-1.5, -0.01, 0.0, 0.01, 1.5):
+            pool.spawn(rng.uniform(-20, 20), rng.uniform(0, 30), edge * 50.0 + nudge, rng.uniform(-30, 30))
+    pool.kill(7)
+    pool.kill(40)
+    for _ in range(400):
+        x, y, z = rng.uniform(-20, 20), rng.uniform(0, 30), 50.0 * rng.integers(-10, 11) + rng.uniform(-6, 6)
+        radius = rng.uniform(1, 20)
+        assert pool.first_in_sphere(x, y, z, radius) == nested_sphere(pool, x, y, z, radius)
+        assert pool.first_in_column(x, z, radius, y - 10, y + 10) == nested_column(pool, x, z, radius, y - 10, y + 10)
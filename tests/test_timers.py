@@ -0,0 +1,101 @@
+from timers import TimerQueue
+
+
+def recorder(fired):
+    def callback(name, result=None):
+        fired.append(name)
+        return result
+    return callback
+
+
+def test_equal_due_times_fire_in_schedule_order():
+    queue, fired = TimerQueue(), []
+    call = recorder(fired)
+    for name in 'abcde':
+        queue.schedule(1.0, call, name)
+    queue.schedule(0.5, call, 'early')
+    queue.run_due(1.0)
+    assert fired == ['early', 'a', 'b', 'c', 'd', 'e']
+    assert len(queue) == 0
+
+
+def test_cancel_and_pending():
+    queue, fired = TimerQueue(), []
+    call = recorder(fired)
+    first = queue.schedule(3.0, call, 'first')
+    second = queue.schedule(1.0, call, 'second')
+    third = queue.schedule(2.0, call, 'third')
+    assert queue.pending() == [second, third, first]
+    queue.cancel(third)
+    queue.cancel(third)
+    queue.cancel(None)
+    assert third.cancelled
+    assert len(queue) == 2
+    assert queue.pending() == [second, first]
+    queue.run_due(10.0)
+    assert fired == ['second', 'first']
+    assert queue.pending() == []
+
+
+def test_run_due_by_simulated_time():
+    queue, fired = TimerQueue(), []
+    call = recorder(fired)
+    for due in (0.25, 0.5, 0.75, 1.0):
+        queue.schedule(due, call, due)
+    queue.run_due(0.6)
+    assert fired == [0.25, 0.5]
+    queue.run_due(0.6)
+    assert fired == [0.25, 0.5]
+    queue.run_due(1.0)
+    assert fired == [0.25, 0.5, 0.75, 1.0]
+
+
+def test_run_due_by_tile_count():
+    queue, fired = TimerQueue(), []
+    call = recorder(fired)
+    queue.schedule(3 + 5, call, 'power_up')
+    queue.schedule(4 + 2, call, 'purple')
+    for tiles in range(3, 10):
+        queue.run_due(tiles)
+        if tiles == 7:
+            assert fired == ['purple']
+    assert fired == ['purple', 'power_up']
+
+
+def test_true_stops_the_run():
+    queue, fired = TimerQueue(), []
+    call = recorder(fired)
+    queue.schedule(1.0, call, 'a')
+    queue.schedule(1.0, call, 'stop', True)
+    queue.schedule(1.0, call, 'c')
+    assert queue.run_due(1.0) is True
+    assert fired == ['a', 'stop']
+    assert len(queue) == 1
+    assert queue.run_due(1.0) is False
+    assert fired == ['a', 'stop', 'c']
+
+
+def test_timers_scheduled_by_a_callback_wait_for_the_next_run():
+    queue, fired = TimerQueue(), []
+
+    def retry(name):
+        fired.append(name)
+        if len(fired) < 3:
+            queue.schedule(1.0, retry, name)
+
+    queue.schedule(1.0, retry, 'retry')
+    queue.run_due(1.0)
+    assert fired == ['retry']
+    queue.run_due(1.0)
+    queue.run_due(1.0)
+    assert fired == ['retry'] * 3
+    assert len(queue) == 0
+
+
+def test_clear_drops_everything():
+    queue, fired = TimerQueue(), []
+    timer = queue.schedule(1.0, recorder(fired), 'x')
+    queue.clear()
+    assert timer.cancelled and len(queue) == 0
+    queue.run_due(5.0)
+    assert fired == []
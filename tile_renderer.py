@@ -0,0 +1,72 @@
+import numpy as np
+from OpenGL.GL import *
+
+# Unit cube centred on the origin, shared by every tile
+CUBE_CORNERS = np.array([
+    (-0.5, 0.5, -0.5), (0.5, 0.5, -0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+    (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, -0.5, 0.5), (-0.5, -0.5, 0.5),
+], dtype=np.float32)
+CUBE_FACES = np.array([
+    0, 3, 2, 1,  4, 5, 6, 7,  0, 1, 5, 4,
+    1, 2, 6, 5,  2, 3, 7, 6,  3, 0, 4, 7,
+], dtype=np.uint32)
+CUBE_EDGES = np.array([
+    0, 1, 1, 2, 2, 3, 3, 0,  4, 5, 5, 6, 6, 7, 7, 4,  0, 4, 1, 5, 2, 6, 3, 7,
+], dtype=np.uint32)
+
+
+class TileRenderer:
+    """Draws every tile body and outline in one glDrawElements call each.
+
+    Each frame the tiles are packed into an (n, 7) array of position at
+    the given simulated time, size and colour. When that array differs
+    from the previous frame the unit cube is expanded into world-space
+    vertices for all tiles at once; the face and edge index buffers are
+    only rebuilt when the tile count changes.
+    """
+
+    def __init__(self, tile_height):
+        self.tile_height = tile_height
+        self.rebuilds = 0
+        self._instances = np.zeros((0, 7), dtype=np.float32)
+        self._vertices = np.zeros((0, 3), dtype=np.float32)
+        self._colors = np.zeros((0, 3), dtype=np.float32)
+        self._face_indices = np.zeros(0, dtype=np.uint32)
+        self._edge_indices = np.zeros(0, dtype=np.uint32)
+
+    def update(self, tiles, time):
+        instances = np.array(
+            [(t.x_at(time), t.y, t.z, t.size, *t.color) for t in tiles],
+            dtype=np.float32).reshape(-1, 7)
+        if np.array_equal(instances, self._instances):
+            return
+        count = len(instances)
+        if count != len(self._instances):
+            base = (np.arange(count, dtype=np.uint32) * len(CUBE_CORNERS))[:, None]
+            self._face_indices = (base + CUBE_FACES).ravel()
+            self._edge_indices = (base + CUBE_EDGES).ravel()
+        scale = np.empty((count, 3), dtype=np.float32)
+        scale[:, 0] = instances[:, 3]
+        scale[:, 1] = self.tile_height
+        scale[:, 2] = instances[:, 3]
+        corners = CUBE_CORNERS[None, :, :] * scale[:, None, :] + instances[:, None, 0:3]
+        self._vertices = np.ascontiguousarray(corners.reshape(-1, 3))
+        self._colors = np.ascontiguousarray(np.repeat(instances[:, 4:7], len(CUBE_CORNERS), axis=0))
+        self._instances = instances
+        self.rebuilds += 1
+
+    def draw(self, tiles, time):
+        self.update(tiles, time)
+        if not len(self._instances):
+            return
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self._vertices)
+
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(3, GL_FLOAT, 0, self._colors)
+        glDrawElements(GL_QUADS, len(self._face_indices), GL_UNSIGNED_INT, self._face_indices)
+        glDisableClientState(GL_COLOR_ARRAY)
+
+        glColor3f(0.0, 0.0, 0.0)
+        glDrawElements(GL_LINES, len(self._edge_indices), GL_UNSIGNED_INT, self._edge_indices)
+        glDisableClientState(GL_VERTEX_ARRAY)
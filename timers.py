@@ -0,0 +1,77 @@
+import heapq
+
+
+class Timer:
+    """A pending call returned by TimerQueue.schedule(); pass it to cancel()."""
+    __slots__ = ('due', 'callback', 'args')
+
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+
+    @property
+    def cancelled(self):
+        return self.callback is None
+
+
+class TimerQueue:
+    """Deadlines kept in a heap so each step only touches the timers that are due.
+
+    `due` can be in any unit that never goes backwards, such as seconds of
+    simulated time or the number of tiles generated so far. Timers with the
+    same due value fire in the order they were scheduled. Cancelled timers
+    stay in the heap and are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._next_id = 0
+        self._pending = 0
+
+    def __len__(self):
+        return self._pending
+
+    def schedule(self, due, callback, *args):
+        timer = Timer(due, callback, args)
+        heapq.heappush(self._heap, (due, self._next_id, timer))
+        self._next_id += 1
+        self._pending += 1
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None and not timer.cancelled:
+            timer.callback = None
+            timer.args = ()
+            self._pending -= 1
+
+    def pending(self):
+        """The timers still waiting, in the order they will fire."""
+        return [timer for _, _, timer in sorted(self._heap) if not timer.cancelled]
+
+    def clear(self):
+        for _, _, timer in self._heap:
+            timer.callback = None
+        self._heap.clear()
+        self._pending = 0
+
+    def run_due(self, now):
+        """Calls every timer due at or before `now`.
+
+        Timers scheduled by a callback wait for the next call, so a callback
+        can re-arm itself with schedule(now, ...) to try again next step.
+        If a callback returns True the run stops there and the remaining due
+        timers wait for the next call; run_due() then returns True as well.
+        """
+        heap = self._heap
+        limit = self._next_id
+        while heap and heap[0][0] <= now and heap[0][1] < limit:
+            _, _, timer = heapq.heappop(heap)
+            callback, args = timer.callback, timer.args
+            if callback is None:
+                continue
+            timer.callback = None
+            self._pending -= 1
+            if callback(*args):
+                return True
+        return False
@@ -0,0 +1,67 @@
+import json
+import os
+import time
+from collections import deque
+
+
+class Tracer:
+    """Buffers trace events in memory and writes them as a Chrome/Perfetto JSON trace.
+
+    span() records a finished phase as one complete ("X") event and
+    instant() a point event such as a game state change. Times are
+    perf_counter_ns readings, shown relative to when the tracer was made.
+    Only the last `max_events` events are kept, so a long session keeps
+    its most recent stretch instead of growing without bound; complete
+    events cannot lose their other half when the oldest ones drop out.
+    """
+
+    def __init__(self, max_events=1000000, process_name="Island Jumper"):
+        self.events = deque(maxlen=max_events)
+        self.process_name = process_name
+        self.origin = time.perf_counter_ns()
+        self.dropped = 0
+
+    def _add(self, event):
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+
+    def span(self, name, start_ns, end_ns, category='frame'):
+        self._add(('X', name, category, start_ns, end_ns - start_ns, None))
+
+    def instant(self, name, args=None, category='game'):
+        self._add(('i', name, category, time.perf_counter_ns(), 0, args))
+
+    def trace_events(self):
+        """The buffered events as Chrome trace-event dicts, timestamps in microseconds."""
+        events = [{'ph': 'M', 'name': 'process_name', 'pid': 1, 'tid': 1, 'args': {'name': self.process_name}},
+                  {'ph': 'M', 'name': 'thread_name', 'pid': 1, 'tid': 1, 'args': {'name': 'main'}}]
+        for phase, name, category, ts, duration, args in self.events:
+            event = {'ph': phase, 'name': name, 'cat': category, 'pid': 1, 'tid': 1,
+                     'ts': (ts - self.origin) / 1000.0}
+            if phase == 'X':
+                event['dur'] = duration / 1000.0
+            else:
+                event['s'] = 'g'
+            if args:
+                event['args'] = args
+            events.append(event)
+        return events
+
+    def write(self, path):
+        """Writes the trace to `path`, replacing it atomically; the buffer is kept."""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, file)
+        os.replace(temporary, path)
+        return len(self.events)
+
+
+def trace_phase_change(tracer, state, before):
+    """Records an instant event if the game phase changed from `before`."""
+    if state.phase == before:
+        return
+    args = {'time': round(state.time, 4), 'score': state.score, 'tiles': state.tile_count}
+    if state.phase == 'GAME_OVER' and state.cause_of_death:
+        args['cause'] = state.cause_of_death
+    tracer.instant(f"{before} -> {state.phase}", args)
@@ -0,0 +1,64 @@
+from collections import deque
+
+
+class TileTrack:
+    """The visible stretch of tiles, oldest first, in a bounded deque.
+
+    Every tile gets a sequence number (seq) that never changes, even after
+    older tiles fall off the front. The track remembers which tile the
+    player stands on by its seq, so the current tile and the next jump
+    target are found by arithmetic instead of by scanning positions.
+    """
+
+    def __init__(self, window=7):
+        if window < 3:
+            raise ValueError("the track needs room for at least the previous, current and next tile")
+        self.window = window
+        self._tiles = deque()
+        self.next_seq = 0
+        self.current_seq = None
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __iter__(self):
+        return iter(self._tiles)
+
+    def __getitem__(self, index):
+        return self._tiles[index]
+
+    @property
+    def first_seq(self):
+        return self.next_seq - len(self._tiles)
+
+    def append(self, tile):
+        tile.seq = self.next_seq
+        self.next_seq += 1
+        self._tiles.append(tile)
+        if len(self._tiles) > self.window:
+            self._tiles.popleft()
+
+    def clear(self):
+        self._tiles.clear()
+        self.current_seq = None
+
+    def by_seq(self, seq):
+        if seq is None:
+            return None
+        index = seq - self.first_seq
+        if 0 <= index < len(self._tiles):
+            return self._tiles[index]
+        return None
+
+    def set_current(self, tile):
+        self.current_seq = None if tile is None else tile.seq
+
+    @property
+    def current(self):
+        return self.by_seq(self.current_seq)
+
+    @property
+    def next_target(self):
+        if self.current_seq is None:
+            return None
+        return self.by_seq(self.current_seq + 1)